@@ -9,7 +9,7 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath('..'))
 
-import Qtc
+import qtc
 
 # -- General configuration ---------------------------------------------
 
@@ -35,9 +35,9 @@ author = "AlexpDev"
 # the built documents.
 #
 # The short X.Y version.
-version = Qtc.__version__
+version = qtc.__version__
 # The full version, including alpha/beta/rc tags.
-release = Qtc.__version__
+release = qtc.__version__
 
 # List of patterns, relative to source directory, that match files and
 # directories to ignore when looking for source files.
@@ -33,8 +33,6 @@
 
 import sys
 import os
-import sched
-import time
 from pathlib import Path
 from threading import Thread
 
@@ -47,26 +45,19 @@ BASE_DIR = Path(BASE_DIR)
 try:
     from qtc.bin.pydenv import pydenv
     pydenv()
-    from qtc.__settings import (DATA_DIR, DB_NAME, DETAILS, DEBUG)
+    from qtc.__settings import (DATA_DIR, DB_NAME, DETAILS, DEBUG, SYNC,
+                                CHANGES_ONLY, HEARTBEAT, DEADLINE,
+                                RETENTION, VACUUM_INTERVAL, INTERVAL,
+                                ACTIVE_INTERVAL, MAX_BACKOFF)
 except:
-    from qtc.settings import (DATA_DIR, DB_NAME, DETAILS, DEBUG)
+    from qtc.settings import (DATA_DIR, DB_NAME, DETAILS, DEBUG, SYNC,
+                              CHANGES_ONLY, HEARTBEAT, DEADLINE,
+                              RETENTION, VACUUM_INTERVAL, INTERVAL,
+                              ACTIVE_INTERVAL, MAX_BACKOFF)
 
 
+from qtc.collector import Collector
 from qtc.storage import SqlStorage
-from qtc.session import SqlSession
-
-
-def timeout_scheduler(scdl,ntrvl,logging,*args):
-    scdl.enter(ntrvl,1,timeout_scheduler,(scdl,ntrvl,logging,*args))
-    logging(*args)
-
-def log(interval,storage):
-    schedule = sched.scheduler(time.time,time.sleep)
-    def logging(interval,storage):
-        storage.log()
-    args = (interval,storage)
-    timeout_scheduler(schedule,interval,logging,*args)
-    schedule.run()
 
 
 def main():
@@ -75,11 +66,19 @@ def main():
         Returns:
             int -- returns 0 on program exit.
     """
-    database_path = BASE_DIR / "Qtc" /  DATA_DIR / DB_NAME
-    storage = SqlStorage(path=database_path,clients=DETAILS,debug=DEBUG)
-    thread = Thread(target=log,args=(1800,storage))
+    database_path = BASE_DIR / "qtc" /  DATA_DIR / DB_NAME
+    storage = SqlStorage(path=database_path,clients=DETAILS,debug=DEBUG,
+                         sync=SYNC,changes_only=CHANGES_ONLY,
+                         heartbeat=HEARTBEAT,deadline=DEADLINE,
+                         retention=RETENTION,vacuum_interval=VACUUM_INTERVAL)
+    collector = Collector(storage,interval=INTERVAL,
+                          active_interval=ACTIVE_INTERVAL,
+                          max_backoff=MAX_BACKOFF)
+    thread = Thread(target=collector.run)
     thread.daemon = True
     thread.start()
+    # Qt is only imported once the first poll is under way.
+    from qtc.session import SqlSession
     session = SqlSession(database_path,DETAILS)
     session.mainloop(BASE_DIR)
     return 0
@@ -0,0 +1,141 @@
+#! /usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+### Qtc v0.2
+###
+### This code written for the "Qtc" program
+###
+### This project is licensed with:
+### GNU AFFERO GENERAL PUBLIC LICENSE
+###
+### Please refer to the LICENSE file locate in the root directory of this
+### project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+### information.
+###
+### THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+### KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+### IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+### THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+### YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+### NECESSARY SERVICING, REPAIR OR CORRECTION.
+###
+### IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+### CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+### INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+### OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+### PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+###
+######
+################################################################################
+""" Headless collector.
+
+    Polls the configured clients and stores their stats without importing
+    Qt, for hosts that have no display. Stops cleanly on SIGINT or SIGTERM
+    once the poll in progress is saved. Failed clients and polls are
+    logged to stderr.
+
+    usage: collect.py [--interval SECONDS] [--db PATH] [--pidfile PATH] [--once]
+"""
+
+import sys
+import os
+import signal
+import logging
+import argparse
+from pathlib import Path
+
+dirname = lambda x: os.path.dirname(x)
+here = dirname(os.path.abspath(__file__))
+BASE_DIR = dirname(dirname(here))
+sys.path.append(BASE_DIR)
+BASE_DIR = Path(BASE_DIR)
+
+try:
+    from qtc.bin.pydenv import pydenv
+    pydenv()
+    from qtc.__settings import (DATA_DIR, DB_NAME, DETAILS, DEBUG, SYNC,
+                                CHANGES_ONLY, HEARTBEAT, DEADLINE,
+                                RETENTION, VACUUM_INTERVAL, INTERVAL,
+                                ACTIVE_INTERVAL, MAX_BACKOFF)
+except:
+    from qtc.settings import (DATA_DIR, DB_NAME, DETAILS, DEBUG, SYNC,
+                              CHANGES_ONLY, HEARTBEAT, DEADLINE,
+                              RETENTION, VACUUM_INTERVAL, INTERVAL,
+                              ACTIVE_INTERVAL, MAX_BACKOFF)
+
+
+from qtc.collector import Collector
+from qtc.storage import SqlStorage
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="collect",
+                                     description="Log torrent stats.")
+    parser.add_argument("--interval", type=float, default=INTERVAL,
+                        help="seconds between polls of an idle client")
+    parser.add_argument("--db", type=Path,
+                        default=BASE_DIR / "qtc" / DATA_DIR / DB_NAME,
+                        help="path to the database file")
+    parser.add_argument("--pidfile", type=Path, default=None,
+                        help="write the process id to this file")
+    parser.add_argument("--once", action="store_true",
+                        help="poll a single time and exit")
+    return parser.parse_args(argv)
+
+
+def running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_pidfile(path):
+    """ Claim `path` for this process.
+
+        Exits if the file names another process that is still running.
+    """
+    if path.is_file():
+        pid = path.read_text().strip()
+        if pid.isdigit() and running(int(pid)):
+            sys.exit(f"collector already running with pid {pid}")
+    path.write_text(str(os.getpid()))
+
+
+def main(argv=None):
+    """ Run the collector until it is signalled to stop.
+
+        Returns:
+            int -- returns 0 on exit.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+    storage = SqlStorage(path=args.db,clients=DETAILS,debug=DEBUG,
+                         sync=SYNC,changes_only=CHANGES_ONLY,
+                         heartbeat=HEARTBEAT,deadline=DEADLINE,
+                         retention=RETENTION,vacuum_interval=VACUUM_INTERVAL)
+    collector = Collector(storage,interval=args.interval,
+                          active_interval=ACTIVE_INTERVAL,
+                          max_backoff=MAX_BACKOFF)
+    signal.signal(signal.SIGINT,collector.stop)
+    signal.signal(signal.SIGTERM,collector.stop)
+    if args.pidfile:
+        write_pidfile(args.pidfile)
+    try:
+        collector.run(once=args.once)
+    finally:
+        storage.connection.close()
+        if args.pidfile and args.pidfile.is_file():
+            args.pidfile.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/python
+#! ~*~ coding: utf-8 ~*~
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+###
+######
+################################################################################
+
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ClientSchedule:
+    """ When one client is due to be polled next.
+
+        Ticks stay on a grid of the current step from the first poll, and
+        ticks missed while a poll ran late are skipped, not caught up on.
+        Each failed poll in a row doubles the step, up to `max_backoff`. A
+        client with transfers in its last sample is polled every
+        `active_interval`.
+    """
+
+    def __init__(self,interval,active_interval,max_backoff,now):
+        self.interval = interval
+        self.active_interval = min(active_interval,interval)
+        self.max_backoff = max(max_backoff,interval)
+        self.due = now
+        self.failures = 0
+        self.busy = False
+
+    @property
+    def step(self):
+        if self.failures:
+            return min(self.interval * 2 ** self.failures,self.max_backoff)
+        if self.busy:
+            return self.active_interval
+        return self.interval
+
+    def update(self,now,failed=False,busy=False):
+        """ Move `due` past `now` after a poll. """
+        self.failures = self.failures + 1 if failed else 0
+        self.busy = busy and not failed
+        step = self.step
+        self.due += step
+        if self.due <= now:
+            self.due += step * ((now - self.due) // step + 1)
+        return self.due
+
+
+class Collector:
+    """ Polls each client of `storage` on its own schedule until stopped.
+
+        Clients are polled every `interval` seconds, unless their entry in
+        `storage.clients` sets an "interval" of its own, and every
+        `active_interval` seconds while they have torrents transferring.
+        Clients that fail back off up to `max_backoff`. Clients due at the
+        same time are polled together.
+
+        Only depends on the storage layer, so it can run inside the GUI
+        process or on its own from `bin/collect.py` without Qt.
+    """
+
+    def __init__(self,storage,interval=1800,active_interval=None,
+                 max_backoff=21600):
+        self.storage = storage
+        self.interval = interval
+        self.active_interval = active_interval or interval
+        self.max_backoff = max_backoff
+        self.schedules = {}
+        self.stopped = threading.Event()
+
+    def schedule(self,client,now):
+        details = self.storage.clients[client] or {}
+        interval = details.get("interval",self.interval)
+        return ClientSchedule(interval,self.active_interval,
+                              self.max_backoff,now)
+
+    def run(self,once=False):
+        """ Poll due clients, then sleep until the next one is due, until
+            `stop()` is called.
+
+            A failed poll is written to the debug log and the loop carries
+            on with the next one.
+        """
+        now = time.monotonic()
+        self.schedules = {client : self.schedule(client,now)
+                          for client in self.storage.clients}
+        while not self.stopped.is_set():
+            now = time.monotonic()
+            due = [client for client,schedule in self.schedules.items()
+                   if schedule.due <= now]
+            if due or not self.schedules:
+                self.poll(due or None)
+            if once:
+                return
+            wake = min((i.due for i in self.schedules.values()),
+                       default=time.monotonic() + self.interval)
+            self.stopped.wait(max(wake - time.monotonic(),0))
+        return
+
+    def poll(self,clients=None):
+        failed = set(clients or ())
+        try:
+            self.storage.log(clients)
+            failed = set(self.storage.failed_clients)
+        except Exception as e:
+            logger.exception("poll failed")
+            self.storage.dbug_out(f"Error: poll failed: {e!r}")
+        now = time.monotonic()
+        for client in clients or ():
+            busy = client in self.storage.busy_clients
+            self.schedules[client].update(now,client in failed,busy)
+        return
+
+    def stop(self,*args):
+        """ Ask the loop to exit after the current poll. Signal safe. """
+        self.stopped.set()
@@ -0,0 +1,425 @@
+#!/usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+###
+######
+################################################################################
+
+import os
+import json
+from datetime import datetime,timedelta,timezone
+import numpy as np
+from PyQt5.QtGui import QStandardItem
+from PyQt5.QtCore import Qt, QPointF
+from qtc.widgets.tables import StandardItem
+
+def qtchart():
+    """ QtChart is only loaded once a chart is actually drawn. """
+    from PyQt5 import QtChart
+    return QtChart
+
+class ItemFactory:
+
+    """ Factory Class for generating items for GUI tables. """
+
+    point_limit = 200   # most points drawn in one chart series
+    point_width = 6     # pixels given to each point when the width is known
+    animation_limit = 100   # charts with more points are not animated
+    byte_scales = (1_000_000_000, 1_000_000, 1000)
+    byte_units = ("GB", "MB", "KB")
+
+    def __init__(self):
+        """ Calls `self.load_fields()` immediately and returns. """
+        self.load_fields()
+
+
+    def load_fields(self):
+        """ loads field data from `fields.json` in the same directory. """
+        path = os.path.dirname(os.path.abspath(__file__))
+        json_file = os.path.join(path,"fields.json")
+        fields = json.load(open(json_file))
+        self.fields = fields
+        self.funcs = {0 : self.column_const,    1 : self.column_bytes,
+                      2 : self.column_duration, 3 : self.column_bps,
+                      4 : self.column_time,     5 : self.column_isotime,
+                      6 : self.column_ratio,    7 : self.column_delta}
+
+    def gen_item(self,field,data):
+        """ StandardItem factory function.
+
+            Takes Item's Header label and corresponding data.
+            Returns QStandardItem for TableView.
+        """
+        item = self.convert_data(field,data)
+        return item
+
+    def transform(self,field,data,display_data,label):
+        item = StandardItem(display_data)
+        item.set_value(data)
+        item.set_field(field)
+        item.set_label(label)
+        item.set_display_value(display_data)
+        item.setFlags(Qt.ItemIsSelectable|Qt.ItemIsEnabled)
+        return item
+
+    def convert_data(self,field,data):
+        """ Function for converting raw data into more readable format. """
+
+        label = self.get_label(field)
+        display_data = self.format_value(field,data)
+        data_item = self.transform(field,data,display_data,label)
+        return data_item
+
+    def format_value(self,field,data):
+        """ Display string for a raw value without building an item. """
+        idx = self.fields[field]["conv"]
+        return self.funcs[idx]([data])[0]
+
+    def format_column(self,field,values):
+        """ Display strings for a whole column of raw values at once.
+
+            `values` can be any sequence, NumPy arrays included. The output
+            matches `format_value` for each value, with None shown as an
+            empty string.
+        """
+        idx = self.fields[field]["conv"]
+        if isinstance(values,np.ndarray) and values.dtype != object:
+            return self.funcs[idx](values)
+        if hasattr(values,"tolist"):
+            values = values.tolist()
+        values = list(values)
+        present = [i for i,v in enumerate(values) if v is not None]
+        if len(present) == len(values):
+            return self.funcs[idx](values)
+        column = [""] * len(values)
+        formatted = self.funcs[idx]([values[i] for i in present])
+        for i,text in zip(present,formatted):
+            column[i] = text
+        return column
+
+    def get_label(self,field):
+        """ Formats the db field to title case for table headers """
+        label = self.fields[field]["label"]
+        return label
+
+    # Converters take a list of raw values and return their display
+    # strings; `format_value` passes a single value as a one item list.
+
+    def column_bytes(self,values):
+        values = np.asarray(values)
+        conds = [values > scale for scale in self.byte_scales]
+        scales = np.select(conds,self.byte_scales,1)
+        units = np.select(conds,self.byte_units," B").tolist()
+        scaled = np.round(values / scales,2).tolist()
+        return [f"{raw} B" if unit == " B" else f"{num}{unit}"
+                for raw,num,unit in zip(values.tolist(),scaled,units)]
+
+    def column_bps(self,values):
+        return [i + "/s" for i in self.column_bytes(values)]
+
+    def column_const(self,values):
+        return [str(i) for i in values]
+
+    def column_duration(self,values):
+        now = datetime.now().timestamp()
+        seconds = np.abs(now - np.asarray(values,dtype=np.float64))
+        return [str(timedelta(seconds=i)) for i in seconds.tolist()]
+
+    def column_time(self,values):
+        stamp = datetime.fromtimestamp
+        return [str(stamp(i)) for i in values]
+
+    def column_isotime(self,values):
+        return [str(self.to_datetime(i)) for i in values]
+
+    def column_ratio(self,values):
+        rounded = np.round(np.asarray(values,dtype=np.float64),5).tolist()
+        return [str(num) if isinstance(raw,float) else str(raw)
+                for raw,num in zip(values,rounded)]
+
+    def column_delta(self,values):
+        return [str(timedelta(seconds=int(i))) for i in values]
+
+    def to_datetime(self,timestamp):
+        """ Poll timestamps are stored as epoch seconds; ISO strings are
+            still accepted.
+        """
+        if isinstance(timestamp,str):
+            return datetime.fromisoformat(timestamp)
+        return datetime.fromtimestamp(timestamp)
+
+    def convert_stamp(self,timestamp):
+        d = self.to_datetime(timestamp)
+        s = f"{d.month}/{d.day} ({d.hour}:{d.minute})"
+        return s
+
+    def compile_torrent_charts(self,db_rows,rollup=None,width=None):
+        """ Factory method for generating charts.
+
+            Input -> All database rows for a single torrent, optionally
+                     the (table, rows) rollup to draw the upload chart from
+                     and the width in pixels the charts are drawn at.
+            Output -> Line and Bar Charts for Ratio and Upload.
+        """
+        bars = self.bar_data(db_rows)
+        line_chart = self.line_chart(db_rows,rollup,width)
+        ul_chart = self.upload_chart(bars,width)
+        ratio_chart = self.ratio_chart(bars,width)
+        return ul_chart, ratio_chart, line_chart
+
+    def bar_data(self,db_rows):
+        """ Values and category labels shared by the bar charts.
+
+            Returns (uploaded, ratios, labels, ul_top, ratio_top).
+        """
+        uls = [row["uploaded"] for row in db_rows]
+        ratios = [row["ratio"] for row in db_rows]
+        seq = [self.convert_stamp(row["timestamp"]) for row in db_rows]
+        ul_top, ratio_top = max(uls,default=0), max(ratios,default=0)
+        return uls, ratios, seq, ul_top, ratio_top
+
+    def max_points(self,width=None):
+        """ Most points a chart `width` pixels wide is given. """
+        if width is None:
+            return self.point_limit
+        return max(min(width // self.point_width,self.point_limit),3)
+
+    def downsample(self,values,threshold):
+        """ Indexes of at most `threshold` of `values` that keep the shape
+            of the series, picked with Largest-Triangle-Three-Buckets.
+
+            The first and last points are always kept. The points between
+            them are split into `threshold - 2` buckets. From each bucket
+            the point forming the largest triangle with the point kept
+            before it and the average of the next bucket is kept, which
+            favours peaks and troughs over flat stretches.
+        """
+        size = len(values)
+        if threshold >= size or threshold < 3:
+            return list(range(size))
+        values = np.asarray(values,dtype=np.float64)
+        every = (size - 2) / (threshold - 2)
+        picked, a = [0], 0
+        for i in range(threshold - 2):
+            start = int(i * every) + 1
+            end = int((i + 1) * every) + 1
+            next_end = max(min(int((i + 2) * every) + 1,size),end + 1)
+            avg_x = (end + next_end - 1) / 2
+            avg_y = values[end:next_end].mean()
+            ay = values[a]
+            area = np.abs((a - avg_x) * (values[start:end] - ay) -
+                          (a - np.arange(start,end)) * (avg_y - ay))
+            a = start + int(area.argmax())
+            picked.append(a)
+        picked.append(size - 1)
+        return picked
+
+    def upload_points(self,bars,width=None):
+        uls, _, seq, ul_top, _ = bars
+        return self.bar_points("Uploaded",uls,seq,ul_top,width)
+
+    def ratio_points(self,bars,width=None):
+        _, ratios, seq, _, ratio_top = bars
+        return self.bar_points("Ratio",ratios,seq,ratio_top,width)
+
+    def bar_points(self,title,values,seq,top_range,width=None):
+        """ (title, values, labels, top) downsampled to fit `width`. """
+        picked = self.downsample(values,self.max_points(width))
+        values = [values[i] for i in picked]
+        seq = [seq[i] for i in picked]
+        return title, values, seq, top_range
+
+    def line_points(self,db_rows,rollup=None,width=None,diffs=None):
+        """ (title, upload diffs, labels, top) for the line chart.
+
+            `diffs` are the `diff_columns` of `db_rows` when already known.
+        """
+        if rollup is not None:
+            title, rollups = self.rollup_diffs(*rollup)
+            seq = [row[0] for row in rollups]
+            uls = np.array([row[1] for row in rollups],dtype=np.int64)
+        else:
+            title = "Upload"
+            if diffs is None:
+                diffs = self.diff_columns(db_rows)
+            secs, uls, _ = diffs
+            seq = [str(timedelta(seconds=i)) for i in secs.tolist()]
+        picked = self.downsample(uls,self.max_points(width))
+        values = uls[picked].tolist()
+        seq = [seq[i] for i in picked]
+        return title, values, seq, int(uls.max()) if len(uls) else 0
+
+    def upload_chart(self,bars,width=None):
+        chart = self.form_chart(qtchart().QBarSeries())
+        return self.update_chart(chart,self.upload_points(bars,width))
+
+    def ratio_chart(self,bars,width=None):
+        chart = self.form_chart(qtchart().QBarSeries())
+        return self.update_chart(chart,self.ratio_points(bars,width))
+
+    def line_chart(self,db_rows,rollup=None,width=None):
+        chart = self.form_chart(qtchart().QLineSeries())
+        return self.update_chart(chart,self.line_points(db_rows,rollup,width))
+
+    def pick_rollup(self,low,high,hourly_span=2*86400,daily_span=7*86400):
+        """ Name of the rollup table suited to charting the epoch range
+            `low` to `high`, or None to chart the raw rows.
+        """
+        span = high - low
+        if span > daily_span:
+            return "daily"
+        if span > hourly_span:
+            return "hourly"
+        return None
+
+    def rollup_diffs(self,table,rows):
+        """ Chart title and (label, uploaded, ratio) for each rollup row.
+
+            Buckets start on UTC hours and days, so they are labelled in
+            UTC as well.
+        """
+        fmt = "%m/%d" if table == "daily" else "%m/%d (%H:00)"
+        title = "Daily Upload" if table == "daily" else "Hourly Upload"
+        title += " (UTC)"
+        utc = lambda x: datetime.fromtimestamp(x,timezone.utc)
+        rows = sorted(rows,key=lambda x: x["bucket"])
+        diffs = [(utc(row["bucket"]).strftime(fmt),
+                  row["uploaded"], row["ratio"]) for row in rows]
+        return title, diffs
+
+
+    def form_chart(self,series):
+        """ Empty chart around `series` with a category and a value axis.
+
+            The chart is meant to be kept and refilled by `update_chart`.
+        """
+        QtChart = qtchart()
+        chart = QtChart.QChart()
+        if isinstance(series,QtChart.QBarSeries):
+            series.append(QtChart.QBarSet(""))
+        chart.addSeries(series)
+
+        xaxis = QtChart.QBarCategoryAxis()
+        yaxis = QtChart.QValueAxis()
+
+        chart.addAxis(xaxis,Qt.AlignBottom)
+        chart.addAxis(yaxis,Qt.AlignLeft)
+
+        series.attachAxis(xaxis)
+        series.attachAxis(yaxis)
+
+        chart.legend().setVisible(True)
+        chart.legend().setAlignment(Qt.AlignBottom)
+
+        return chart
+
+    def update_chart(self,chart,points):
+        """ Refill a chart from `form_chart` with (title, values, labels,
+            top) in place.
+
+            The series data is swapped in one call and the axes are reused.
+            Animations are turned off above `animation_limit` points.
+        """
+        QtChart = qtchart()
+        title, values, cats, top_range = points
+        series = chart.series()[0]
+        if isinstance(series,QtChart.QBarSeries):
+            barset = series.barSets()[0]
+            barset.setLabel(title)
+            barset.remove(0,barset.count())
+            barset.append(values)
+        else:
+            series.replace([QPointF(i,v) for i,v in enumerate(values)])
+        chart.setTitle(title)
+        if len(values) > self.animation_limit:
+            chart.setAnimationOptions(QtChart.QChart.NoAnimation)
+        else:
+            chart.setAnimationOptions(QtChart.QChart.SeriesAnimations)
+        xaxis = chart.axes(Qt.Horizontal)[0]
+        yaxis = chart.axes(Qt.Vertical)[0]
+        xaxis.setCategories(cats)
+        yaxis.setRange(0,top_range)
+        return chart
+
+
+    def fill_gaps(self,rows,stamps,until=None):
+        """ Sort rows by time and carry each one forward over missing polls.
+
+            `stamps` are the poll timestamps; any of them falling between
+            the first row and `until` (the last row by default) without a
+            row of its own gets a copy of the previous row.
+        """
+        rows = sorted(rows,key=lambda x: x["timestamp"])
+        if not rows: return rows
+        first, last = rows[0]["timestamp"], rows[-1]["timestamp"]
+        if until is not None:
+            last = max(last,until)
+        filled, idx = [], 0
+        for stamp in sorted(stamps):
+            if stamp < first or stamp > last:
+                continue
+            while idx < len(rows) and rows[idx]["timestamp"] <= stamp:
+                filled.append(rows[idx])
+                idx += 1
+            if filled[-1]["timestamp"] != stamp:
+                filled.append(dict(filled[-1],timestamp=stamp))
+        filled.extend(rows[idx:])
+        return filled
+
+    def to_epoch(self,timestamp):
+        """ Epoch seconds of a poll timestamp. """
+        if isinstance(timestamp,str):
+            return int(datetime.fromisoformat(timestamp).timestamp())
+        return timestamp
+
+    def diff_columns(self,rows):
+        """ Seconds, upload and ratio deltas between consecutive rows.
+
+            Timestamps are parsed once into an int64 epoch array and the
+            deltas computed over the sorted columns with NumPy. Steps where
+            neither upload nor ratio changed are masked out. Returns
+            (seconds, uploaded, ratio) arrays of equal length.
+        """
+        count = len(rows)
+        column = lambda field, dtype: np.fromiter(
+            (row[field] for row in rows),dtype=dtype,count=count)
+        epochs = (self.to_epoch(row["timestamp"]) for row in rows)
+        stamps = np.fromiter(epochs,dtype=np.int64,count=count)
+        order = np.argsort(stamps,kind="stable")
+        secs = np.diff(stamps[order])
+        ul_diffs = np.abs(np.diff(column("uploaded",np.int64)[order]))
+        ratio_diffs = np.abs(np.diff(column("ratio",np.float64)[order]))
+        keep = (ul_diffs != 0) | (ratio_diffs != 0)
+        return secs[keep], ul_diffs[keep], ratio_diffs[keep]
+
+    def calculate_diffs(self,rows):
+        """ (elapsed timedelta, upload delta, ratio delta) per changed step. """
+        secs, uls, ratios = (i.tolist() for i in self.diff_columns(rows))
+        for sec,ul,ratio in zip(secs,uls,ratios):
+            yield (timedelta(seconds=sec), ul, ratio)
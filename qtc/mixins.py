@@ -0,0 +1,437 @@
+#!/usr/bin/python
+#! ~*~ coding: utf-8 ~*~
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+###
+######
+################################################################################
+
+
+import os
+import sys
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RequestError(Exception):
+    pass
+
+
+def http():
+    """ The `requests` module, imported on the first request.
+
+        Importing it costs about as much as the rest of the collector's
+        start up, so modules that only need the database skip it.
+    """
+    import requests
+    return requests
+
+
+class RequestMixin:
+
+    timeout = 15
+
+    def login(self,url=None,credentials=None):
+        url += "auth/login"
+        response = http().get(url, params=credentials,
+                              timeout=self.timeout)
+        self.check_response(response)
+        return response
+
+    def check_response(self, response):
+        if response.status_code == 200:
+            return True
+        else:
+            raise RequestError
+
+    def get_info(self,resp,url=None):
+        url += "torrents/info"
+        cookies = resp.cookies
+        response = http().get(url, cookies=cookies, timeout=self.timeout)
+        self.check_response(response)
+        data = response.json()
+        return data
+
+    def get_properties(self,url,cookies,torrent_hash):
+        url += "torrents/properties"
+        params = {"hash" : torrent_hash}
+        resp = http().get(url,cookies=cookies,params=params,
+                          timeout=self.timeout)
+        self.check_response(resp)
+        data = resp.json()
+        return data
+
+    def get_trackers(self,url,cookies,torrent_hash):
+        url += "torrents/trackers"
+        params = {"hash" : torrent_hash}
+        resp = http().get(url,cookies=cookies,params=params,
+                          timeout=self.timeout)
+        self.check_response(resp)
+        data = resp.json()
+        return data
+
+    def get_sync(self,url,cookies,rid=0):
+        url += "sync/maindata?rid=" + str(rid)
+        resp = http().get(url,cookies=cookies,timeout=self.timeout)
+        self.check_response(resp)
+        data = resp.json()
+        return data
+
+    def get_log(self,url,cookies,flags=[]):
+        url += "log/main"
+        flag_dict = ["normal","info","warning","critical"]
+        if not flags:
+            flags = flag_dict
+        params = dict([(i,"true") for i in flags])
+        resp = http().get(url,cookies=cookies,params=params,
+                          timeout=self.timeout)
+        self.check_response(resp)
+        data = resp.json()
+        return data
+
+
+class ClientConnection:
+    """ Web API connection to a single client.
+
+        Holds a pooled `requests.Session` so the TCP/TLS connection and the
+        SID cookie are reused between polls. The client is only logged into
+        again when it answers with 403.
+    """
+
+    def __init__(self,url,credentials,timeout=15):
+        self.url = url.rstrip("/") + "/"
+        self.credentials = credentials
+        self.timeout = timeout
+        self.session = http().Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        self.logged_in = False
+
+    def login(self):
+        url = self.url + "auth/login"
+        response = self.session.get(url,params=self.credentials,
+                                    timeout=self.timeout)
+        self.check_response(response)
+        self.logged_in = True
+        return response
+
+    def check_response(self,response):
+        if response.status_code == 200:
+            return True
+        else:
+            raise RequestError
+
+    def request(self,endpoint,params=None):
+        """ GET `endpoint` and return the decoded json body. """
+        if not self.logged_in:
+            self.login()
+        url = self.url + endpoint
+        response = self.session.get(url,params=params,timeout=self.timeout)
+        if response.status_code == 403:
+            self.login()
+            response = self.session.get(url,params=params,
+                                        timeout=self.timeout)
+        self.check_response(response)
+        return response.json()
+
+    def get_info(self):
+        return self.request("torrents/info")
+
+    def get_sync(self,rid=0):
+        return self.request("sync/maindata",params={"rid" : rid})
+
+    def close(self):
+        self.session.close()
+
+
+class QueryMixin:
+
+    def log_timestamp(self,stamp,client=None):
+        with self.connection as cur:
+            statement = "INSERT INTO stamps (ts, client) VALUES (?, ?)"
+            cur.execute(statement,(stamp,client))
+        return
+
+    def save_to_db(self,data,table_name):
+        with self.connection as cur:
+            columns, values, params = self.get_save_values(data)
+            stat = f"INSERT INTO {table_name} ({columns}) VALUES ({params})"
+            cur.execute(stat,tuple(values))
+        return
+
+    def save_many_to_db(self,columns,commit_values,params,table_name):
+        with self.connection as cur:
+            cmd = f"INSERT INTO {table_name} ({columns}) VALUES ({params})"
+            cur.executemany(cmd,commit_values)
+        return
+
+    def upsert_many_to_db(self,columns,commit_values,params,table_name,
+                          keys,updates):
+        with self.connection as cur:
+            cmd = (f"INSERT INTO {table_name} ({columns}) VALUES ({params}) "
+                   f"ON CONFLICT ({keys}) DO UPDATE SET {updates}")
+            cur.executemany(cmd,commit_values)
+        return
+
+    def select_rows(self,table):
+        with self.connection as cur:
+            statement = f"SELECT * FROM {table}"
+            r = cur.execute(statement)
+            rows = r.fetchall()
+        return rows
+
+    def select_where(self,table,field,value):
+        with self.connection as cur:
+            stmnt = f"SELECT * FROM {table} WHERE {field} == ?"
+            r = cur.execute(stmnt,(value,))
+            rows = r.fetchall()
+        return rows
+
+    def select_where_and(self,table,**kwargs):
+        with self.connection as cur:
+            s = " AND ".join([k + " = ?"  for k in kwargs.keys()]) + ")"
+            query = f"SELECT * FROM {table} WHERE (" + s
+            r = cur.execute(query,tuple(kwargs.values()))
+            rows = r.fetchall()
+        return rows
+
+    def select_data_where(self,field,value,table="data"):
+        """ `data` (or `latest`) rows joined with the client and hash of
+            their torrent.
+
+            The row's `ts` is also returned as `timestamp`.
+        """
+        with self.connection as cur:
+            query = ("SELECT static.client, static.hash, "
+                     f"{table}.ts AS timestamp, {table}.* FROM {table} "
+                     f"JOIN static ON static.id == {table}.torrent_id "
+                     f"WHERE {field} == ?")
+            r = cur.execute(query,(value,))
+            rows = r.fetchall()
+        return rows
+
+    def select_max(self,table,field,**kwargs):
+        """ Largest `field` value in `table`, optionally only over rows
+            matching the keyword arguments.
+        """
+        where = " AND ".join(k + " == ?" for k in kwargs)
+        with self.connection as cur:
+            query = f"SELECT MAX({field}) FROM {table}"
+            if where:
+                query += " WHERE " + where
+            r = cur.execute(query,tuple(kwargs.values()))
+            value = r.fetchone()[0]
+        return value
+
+    def select_data_max(self,column,client):
+        """ Largest `data` value of `column` for each of a client's
+            torrents, as (hash, value) rows.
+        """
+        with self.connection as cur:
+            query = (f"SELECT static.hash, MAX(data.{column}) AS value "
+                     "FROM static CROSS JOIN data "
+                     "ON data.torrent_id == static.id "
+                     "WHERE static.client == ? GROUP BY static.id")
+            r = cur.execute(query,(client,))
+            rows = r.fetchall()
+        return rows
+
+    def select_between(self,table,field,low,high,**kwargs):
+        where = "".join(f" AND {k} == ?" for k in kwargs)
+        with self.connection as cur:
+            query = (f"SELECT * FROM {table} "
+                     f"WHERE {field} BETWEEN ? AND ?{where}")
+            r = cur.execute(query,(low,high) + tuple(kwargs.values()))
+            rows = r.fetchall()
+        return rows
+
+    def table_columns(self,table_name):
+        with self.connection as cur:
+            r = cur.execute(f"PRAGMA table_info({table_name})")
+            columns = [row["name"] for row in r.fetchall()]
+        return columns
+
+    def select_fields(self,table,fields,condition,value):
+        with self.connection as cur:
+            query = f"SELECT {fields} FROM {table} WHERE {condition} == ?"
+            r = cur.execute(query,(value,))
+            rows = r.fetchall()
+        return rows
+
+    def create_db_table(self,headers,table_name):
+        with self.connection as cur:
+            statement = f"CREATE TABLE {table_name} ({headers})"
+            cur.execute(statement)
+        return
+
+    def create_db_index(self,index_name,table_name,columns,unique=False):
+        with self.connection as cur:
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            statement = (f"CREATE {kind} IF NOT EXISTS {index_name} "
+                         f"ON {table_name} ({columns})")
+            cur.execute(statement)
+        return
+
+    def table_exists(self,table_name):
+        with self.connection as cur:
+            statement = ("SELECT name FROM sqlite_master "
+                         "WHERE type == 'table' AND name == ?")
+            r = cur.execute(statement,(table_name,))
+            row = r.fetchone()
+        return row is not None
+
+    def get_schema_version(self):
+        with self.connection as cur:
+            r = cur.execute("PRAGMA user_version")
+            version = r.fetchone()[0]
+        return version
+
+    def set_schema_version(self,version):
+        with self.connection as cur:
+            cur.execute(f"PRAGMA user_version = {int(version)}")
+        return
+
+    def update_row(self,table_name,data,**kwargs):
+        with self.connection as cur:
+            columns = ", ".join([k + " = ?" for k in data.keys()])
+            s = " AND ".join([k + " = ?"  for k in kwargs.keys()]) + ")"
+            statement = f"UPDATE {table_name} SET {columns} WHERE (" + s
+            values = tuple(data.values()) + tuple(kwargs.values())
+            cur.execute(statement,values)
+        return
+
+    def update_table(self,table,column,value,hashe):
+        with self.connection as cur:
+            statement = f"UPDATE {table} SET {column} = ? WHERE hash == ?"
+            cur.execute(statement,(value,hashe))
+        return
+
+
+    def delete_row(self,table_name,**kwargs):
+        with self.connection as cur:
+            s = " AND ".join([k + " = ?"  for k in kwargs.keys()]) + ")"
+            statement = f"DELETE FROM {table_name} WHERE (" + s
+            cur.execute(statement,tuple(kwargs.values()))
+        return
+
+
+class SqlConnect:
+    """ Context Manager Class for connection and cursor to the database.
+
+        Every thread keeps its own long lived connection, so the collector
+        thread and the GUI thread each reuse a warm connection and its cache
+        of prepared statements. Changes are committed when the outermost
+        `with` block or `transaction()` scope exits.
+
+        The database runs in WAL mode, so `readonly` connections (used by
+        the GUI) read the last committed state without waiting for a poll
+        that is being written.
+    """
+
+    def __init__(self,path,readonly=False,busy_timeout=10,
+                 cached_statements=256):
+        self.path = path
+        self.readonly = readonly
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self.local = threading.local()
+
+    @property
+    def conn(self):
+        """ The calling thread's connection, opened on first use. """
+        conn = getattr(self.local,"conn",None)
+        if conn is None:
+            conn = sqlite3.connect(self.path,timeout=self.busy_timeout,
+                                   cached_statements=self.cached_statements)
+            conn.row_factory = sqlite3.Row
+            self.configure(conn)
+            self.local.conn = conn
+            self.local.cursors = []
+            self.local.depth = 0
+        return conn
+
+    def configure(self,conn):
+        timeout = int(self.busy_timeout * 1000)
+        conn.execute(f"PRAGMA busy_timeout = {timeout}")
+        if self.readonly:
+            conn.execute("PRAGMA query_only = ON")
+            return
+        if not conn.execute("PRAGMA page_count").fetchone()[0]:
+            # auto_vacuum only takes effect before the first page is
+            # written, and switching to WAL writes it.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+    @contextmanager
+    def transaction(self):
+        """ Group every statement run inside the scope into one commit.
+
+            Scopes can be nested; only the outermost one commits, and an
+            exception rolls the whole transaction back, schema changes
+            included.
+        """
+        conn = self.conn
+        if not self.local.depth and not conn.in_transaction:
+            conn.execute("BEGIN")
+        self.local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self.local.depth -= 1
+            if not self.local.depth:
+                conn.rollback()
+            raise
+        self.local.depth -= 1
+        if not self.local.depth:
+            conn.commit()
+
+    def close(self):
+        """ Close the calling thread's connection if it has one. """
+        conn = getattr(self.local,"conn",None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def __enter__(self):
+        curs = self.conn.cursor()
+        self.local.cursors.append(curs)
+        self.local.depth += 1
+        return curs
+
+    def __exit__(self,exc_type,*args):
+        self.local.cursors.pop().close()
+        self.local.depth -= 1
+        if self.local.depth:
+            return
+        if exc_type is None:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
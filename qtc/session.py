@@ -0,0 +1,208 @@
+#!/usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+###
+######
+################################################################################
+
+import sys
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QIcon
+
+from qtc.mixins import QueryMixin, SqlConnect
+from qtc.factory import ItemFactory
+from qtc.storage import ROLLUPS
+from qtc.window import Win
+
+
+class BaseSession:
+    def __init__(self,path,clients,*args,**kwargs):
+        self.path = path
+        self.clients = clients
+        self.static_fields = ("name", "client", "total_size",
+                              "tracker", "added_on", "hash",
+                              "save_path", "category", "completion_on",
+                              "state", "magnet_uri", "tags")
+
+        self.data_fields = ("timestamp", "uploaded", "downloaded",
+                            "ratio", "size", "time_active",
+                            "seen_complete", "last_activity", "hash",
+                            "client", "downloaded_session", "uploaded_session",
+                            "upspeed", "dlspeed", "completed",
+                            "num_complete", "num_seeds", "num_incomplete",
+                            "num_leechs",)
+
+
+class SqlSession(QueryMixin,BaseSession):
+    def __init__(self,path,clients,*args,**kwargs):
+        super().__init__(path,clients)
+        self.path = path
+        self.clients = clients
+        self.connection = SqlConnect(self.path,readonly=True)
+        self.factory = ItemFactory()
+        self.active_stamp = None
+        self.active_hashes = []
+
+    def gen_items(self,field,data):
+        item = self.factory.gen_item(field,data)
+        return item
+
+    def format_value(self,field,data):
+        return self.factory.format_value(field,data)
+
+    def format_column(self,field,values):
+        return self.factory.format_column(field,values)
+
+    def get_headers(self,fields):
+        headers = [self.factory.get_label(i) for i in fields]
+        return headers
+
+    def get_client_names(self):
+        names = [i for i in self.clients]
+        return names
+
+    def get_torrent_names(self,client):
+        table = "static"
+        field = "client"
+        rows = self.select_where(table,field,client)
+        rows = sorted(rows,key=lambda x: x["name"])
+        return rows
+
+    def get_client_torrents(self,client):
+        static = self.get_torrent_names(client)
+
+    def get_torrent_id(self,torrent_hash,client):
+        rows = self.get_static_rows(torrent_hash,client)
+        if not rows:
+            return None
+        return rows[0]["id"]
+
+    def get_data_rows(self,torrent_hash,client):
+        """ Every poll of a torrent, with polls skipped in change only mode
+            filled in from the row before them, up to the last poll that
+            reported the torrent.
+
+            Rows carry the torrent's client and hash, and the poll time as
+            epoch seconds under `timestamp`.
+        """
+        torrent_id = self.get_torrent_id(torrent_hash,client)
+        rows = self.select_data_where("data.torrent_id",torrent_id)
+        if not rows:
+            return rows
+        first = min(i["timestamp"] for i in rows)
+        last = max(i["timestamp"] for i in rows)
+        latest = self.select_where("latest","torrent_id",torrent_id)
+        if latest and latest[0]["seen"] is not None:
+            last = max(last,latest[0]["seen"])
+        stamps = self.select_between("stamps","ts",first,last,client=client)
+        stamps = [i["ts"] for i in stamps]
+        return self.factory.fill_gaps(rows,stamps,last)
+
+    def get_rollup_rows(self,torrent_hash,client,db_rows):
+        """ Rollup rows covering the torrent's whole recorded history.
+
+            The range runs from the oldest daily bucket or raw row to the
+            newest one, so history whose raw rows were pruned is still
+            charted. Returns the rollup table name and its rows in that
+            range, or None when the history is short enough to chart the
+            raw rows directly.
+        """
+        torrent_id = self.get_torrent_id(torrent_hash,client)
+        if torrent_id is None:
+            return None
+        daily = self.select_where("daily","torrent_id",torrent_id)
+        stamps = [self.factory.to_epoch(row["timestamp"]) for row in db_rows]
+        stamps += [row["bucket"] for row in daily]
+        if not stamps:
+            return None
+        low, high = min(stamps), max(stamps)
+        table = self.factory.pick_rollup(low,high)
+        if table is None:
+            return None
+        if table == "daily":
+            return table, daily
+        low -= low % ROLLUPS[table]
+        rows = self.select_between(table,"bucket",low,high,
+                                   torrent_id=torrent_id)
+        return table, rows
+
+    def get_static_rows(self,torrent_hash,client):
+        kwargs = {"client" : client, "hash" : torrent_hash}
+        rows = self.select_where_and("static",**kwargs)
+        return rows
+
+    def end_session(self):
+        sys.exit(self.app.exec_())
+
+    def get_client_data(self,client):
+        data = self.select_data_where("static.client",client)
+        ul_chart,ratio_chart = self.factory.compiledata(data)
+        return ul_chart,ratio_chart
+
+    def get_top_rows(self,client,field):
+        """ Maps each of the client's torrent hashes to its largest value
+            of `field`.
+        """
+        if field not in self.data_fields:
+            raise KeyError(field)
+        column = "ts" if field == "timestamp" else field
+        rows = self.select_data_max(column,client)
+        return {row["hash"] : row["value"] for row in rows}
+
+    def get_active_hashes(self):
+        """ Hashes of the torrents each client reported in its most recent
+            poll, written to `data` or not.
+
+            The newest polls are read from the stamps index and their
+            hashes are only queried again once a newer poll has been
+            stored.
+        """
+        stamps = {client : self.select_max("stamps","ts",client=client)
+                  for client in self.clients}
+        if self.active_stamp != stamps:
+            hashes = []
+            for timestamp in set(stamps.values()) - {None}:
+                rows = self.select_data_where("latest.seen",timestamp,
+                                              table="latest")
+                hashes += [i["hash"] for i in rows
+                           if stamps.get(i["client"]) == timestamp]
+            self.active_hashes = hashes
+            self.active_stamp = stamps
+        return list(self.active_hashes)
+
+    def mainloop(self,BASE_DIR):
+        self.Base_Dir = BASE_DIR
+        self.app = QApplication(sys.argv)
+        self.win = Win()
+        self.win.assign_session(self)
+        self.app.setWindowIcon(QIcon(str(BASE_DIR/"qtc"/"icons"/"WinIcon.png")))
+        self.win.show()
+        sys.exit(self.app.exec_())
+
@@ -75,9 +75,44 @@ DB_NAME = "qbtdata.db"
 ## starting the application.
 DATA_DIR = "data"
 
+## Seconds between polls of the clients.
+INTERVAL = 1800
+ACTIVE_INTERVAL = 300
+MAX_BACKOFF = 21600
+
 ## Setting this to true currently does nothing.
 DEBUG = False  # TODO #
 
+## When True each poll asks the client only for torrents and fields that
+## changed since the previous poll (sync/maindata) instead of the full
+## torrent list. Set to False to always request the full list.
+SYNC = True
+
+## When True a new row is stored only when a torrent's ratio, uploaded,
+## downloaded, completed or size changed since its last stored row, plus one
+## row every HEARTBEAT seconds. Polls in between are filled in when read.
+CHANGES_ONLY = False
+HEARTBEAT = 21600
+
+## Clients are polled in parallel. A client that has not answered within
+## DEADLINE seconds is skipped for that poll and the others are still saved.
+DEADLINE = 30
+
+## How long history is kept, in seconds, or None to keep it forever. Raw
+## snapshots ("data") are kept forever by default since the tables and bar
+## charts only show raw rows; hourly totals are kept for about 6 months and
+## daily totals forever. Old rows are removed a few thousand at a time after
+## each poll.
+RETENTION = {
+    "data": None,
+    "hourly": 182 * 86400,
+    "daily": None,
+}
+
+## Seconds between returning free database pages to the file system, or None
+## to never vacuum.
+VACUUM_INTERVAL = 7 * 86400
+
 
 ## Variable map read in by the application.
 DETAILS = {
@@ -0,0 +1,782 @@
+#! /usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+### Qtc v0.2
+### a.k.a. QTorrentCompanion
+### This code written for the "Qtc" program
+###
+### This project is licensed with:
+### GNU AFFERO GENERAL PUBLIC LICENSE
+###
+### Please refer to the LICENSE file locate in the root directory of this
+### project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+### information.
+###
+### THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+### KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+### IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+### THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+### YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+### NECESSARY SERVICING, REPAIR OR CORRECTION.
+###
+### IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+### CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+### INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+### OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+### PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+######
+################################################################################
+
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+
+from qtc.mixins import ClientConnection, QueryMixin, RequestMixin, SqlConnect
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 5
+
+ROLLUPS = {"hourly": 3600, "daily": 86400}
+
+class ConfigurationError(Exception):
+    pass
+
+class BaseStorage(RequestMixin):
+
+    def __init__(self, path=None, clients=None, debug=False, sync=False,
+                 deadline=30, *args, **kwargs):
+        self.path = path
+        self.clients = clients
+        self.debug = debug
+        self.sync = sync
+        self.deadline = deadline
+        self.timeout = deadline / 2
+        self.failed_clients = {}
+        self.busy_clients = set()
+        self.connections = {}
+        self.rids = {}
+        self.torrents = {}
+        self.static_fields = ("hash", "client", "name",
+                              "tracker", "magnet_uri",
+                              "save_path", "total_size",
+                              "added_on", "completion_on",
+                              "state", "category", "tags")
+        self.data_fields = ("hash", "client", "timestamp",
+                            "ratio", "uploaded", "time_active",
+                            "completed", "size", "downloaded",
+                            "num_seeds", "num_leechs", "last_activity",
+                            "seen_complete", "dlspeed", "upspeed",
+                            "num_complete", "num_incomplete",
+                            "downloaded_session", "uploaded_session")
+        self.counter_fields = self.data_fields[3:]
+        self.data_columns = ("torrent_id", "ts") + self.counter_fields
+
+    def get_connection(self, client):
+        """ The client's `ClientConnection`, created on first use. """
+        if client not in self.connections:
+            client_details = self.clients[client]
+            url = client_details["url"]
+            credentials = client_details["credentials"]
+            self.connections[client] = ClientConnection(
+                url, credentials, timeout=self.timeout)
+        return self.connections[client]
+
+    def make_client_requests(self, client):
+        connection = self.get_connection(client)
+        data = connection.get_info()
+        return data
+
+    def make_client_sync_requests(self, client):
+        """ Request only what changed since the last poll of `client`.
+
+            Uses the `sync/maindata` rid protocol and merges the partial
+            update into the client's in memory torrent state.
+        """
+        connection = self.get_connection(client)
+        rid = self.rids.get(client, 0)
+        data = connection.get_sync(rid=rid)
+        torrents = self.merge_sync(client, data)
+        return [torrent.copy() for torrent in torrents.values()]
+
+    def merge_sync(self, client, data):
+        """ Apply a `sync/maindata` response to the client's torrent state.
+
+            The state is rebuilt from scratch only when the server answers
+            with `full_update`, otherwise the changed fields are merged in
+            and removed torrents are dropped.
+        """
+        state = self.torrents.setdefault(client, {})
+        if data.get("full_update"):
+            state.clear()
+        for torrent_hash, fields in data.get("torrents", {}).items():
+            torrent = state.setdefault(torrent_hash, {"hash": torrent_hash})
+            torrent.update(fields)
+        for torrent_hash in data.get("torrents_removed", []):
+            state.pop(torrent_hash, None)
+        self.rids[client] = data.get("rid", 0)
+        return state
+
+    def filter_static_fields(self, torrent):
+        info = torrent.copy()
+        for k in torrent:
+            if k not in self.static_fields:
+                del info[k]
+        return info
+
+    def filter_data_fields(self, torrent):
+        info = torrent.copy()
+        for k in torrent:
+            if k not in self.data_fields:
+                del info[k]
+        return info
+
+    def dbug_out(self,msg):
+        if self.debug:
+            with open(self.dbug_path,"at") as fd:
+                fd.write(msg + "\n")
+                print(msg)
+        return
+
+    def dbug_first(self,msg):
+        if not self.debug: return
+        self.dbug_path = self.path.parent / "debug.log"
+        with open(self.dbug_path,"at") as fd:
+            ts = datetime.isoformat(datetime.now())
+            ts_len, output = len(ts), "Debug Log - " + ts
+            fd.write(output + "\n")
+            fd.write("-"*(ts_len + 9) + "\n")
+        self.dbug_out(msg)
+
+class SqlStorage(BaseStorage, QueryMixin):
+
+    tracked_fields = ("ratio", "uploaded", "downloaded", "completed", "size")
+
+    def __init__(self, path=None, clients=None, debug=False, sync=False,
+                 changes_only=False, heartbeat=21600, deadline=30,
+                 retention=None, vacuum_interval=None, *args, **kwargs):
+        super().__init__(path=path, clients=clients, debug=debug, sync=sync,
+                         deadline=deadline)
+        self.path = path
+        self.clients = clients
+        self.changes_only = changes_only
+        self.heartbeat = heartbeat
+        self.retention = retention or {}
+        self.vacuum_interval = vacuum_interval
+        self.last_vacuum = None
+        self.prune_batch_size = 5000
+        self.prune_batches = 20
+        self.ingest_batch_size = 500
+        self.connection = SqlConnect(self.path)
+        self.migrated = False
+        self.static_rows = {}
+        self.written_rows = {}
+        self.samples = []
+        self.dbug_first("First Output: Storage Initialized")
+
+    def log(self, clients=None):
+        """ Poll `clients` (all of them by default) and store the results.
+
+            Every client that answered gets a stamp for this poll; clients
+            in `self.failed_clients` get none, so their last stamp still
+            points at their last successful poll.
+        """
+        self.dbug_out("Data retreival and storage process initialized.")
+        if not self.check_path():
+            self.dbug_out("Error: No database discovered. Beginning \
+                                                Clean Install Script")
+            self.installation_script()
+        self.migrate()
+        self.timestamp = int(datetime.now().timestamp())
+        self.heartbeat_stamp = self.timestamp - self.heartbeat
+        clients = list(self.clients if clients is None else clients)
+        data = self.get_data(clients)
+        with self.poll_transaction():
+            self.format_data(data)
+            for client in clients:
+                if client in self.failed_clients: continue
+                self.log_timestamp(self.timestamp, client)
+        self.prune()
+        return
+
+    def prune(self):
+        """ Delete history older than the retention policy allows.
+
+            `self.retention` maps "data", "hourly" and "daily" to a maximum
+            age in seconds (None keeps everything). Rows go in batches of
+            `prune_batch_size`, each in its own short transaction, and at
+            most `prune_batches` batches run per call; the rest is left for
+            the next poll. The newest raw row of every torrent is kept.
+        """
+        budget = self.prune_batches
+        for table in ("data", "hourly", "daily"):
+            if self.retention.get(table) is None:
+                continue
+            cutoff = self.timestamp - self.retention[table]
+            while budget:
+                budget -= 1
+                if self.prune_table(table, cutoff) < self.prune_batch_size:
+                    break
+        if self.retention.get("data") is not None:
+            cutoff = self.timestamp - self.retention["data"]
+            with self.connection as cur:
+                cur.execute("DELETE FROM stamps WHERE ts < ?", (cutoff,))
+        self.vacuum()
+        return
+
+    def prune_table(self, table, cutoff):
+        """ Delete one batch of `table` rows older than `cutoff`.
+
+            The cross join walks `static` first so every torrent's rows are
+            found through the (torrent_id, ts) index.
+        """
+        column, keep = "bucket", ""
+        if table == "data":
+            column = "ts"
+            keep = ("AND data.ts < (SELECT MAX(ts) FROM data AS last "
+                    "WHERE last.torrent_id == static.id)")
+        statement = (f"DELETE FROM {table} WHERE rowid IN "
+                     f"(SELECT {table}.rowid FROM static "
+                     f"CROSS JOIN {table} ON {table}.torrent_id == static.id "
+                     f"WHERE {table}.{column} < ? {keep} LIMIT ?)")
+        with self.connection.transaction():
+            with self.connection as cur:
+                cur.execute(statement, (cutoff, self.prune_batch_size))
+                deleted = cur.rowcount
+        self.dbug_out(f"Pruned {deleted} rows from {table}.")
+        return deleted
+
+    def vacuum(self, force=False):
+        """ Give free pages back to the file system every `vacuum_interval`.
+
+            Databases in incremental auto vacuum mode release their free
+            pages directly; older ones get one full VACUUM, which also
+            switches them to incremental mode. The first call after start
+            always runs, so frequent restarts cannot postpone it.
+        """
+        if self.vacuum_interval is None and not force:
+            return
+        if not force and self.last_vacuum is not None:
+            if time.monotonic() - self.last_vacuum < self.vacuum_interval:
+                return
+        self.last_vacuum = time.monotonic()
+        with self.connection as cur:
+            mode = cur.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if mode == 2:
+                cur.execute("PRAGMA incremental_vacuum").fetchall()
+                return
+            cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cur.execute("VACUUM")
+        self.dbug_out("Database vacuumed.")
+        return
+
+    def get_data(self, clients=None):
+        """ Poll `clients` (all of them by default) in parallel and return
+            an iterator over their torrents.
+
+            Each client gets `self.deadline` seconds to answer. Clients that
+            error or run out of time are recorded in `self.failed_clients`
+            and the torrents of the others are still returned. All requests
+            have finished or been given up on when this returns. Clients
+            with a torrent transferring are collected in
+            `self.busy_clients` as the iterator is consumed.
+        """
+        if not self.clients:
+            self.dbug_out("Error: Client details ommited from config file. Waiting for user to provide address and login information.")
+            raise ConfigurationError
+
+        if clients is None:
+            clients = list(self.clients)
+        self.failed_clients = {}
+        self.busy_clients = set()
+        pool = ThreadPoolExecutor(max_workers=max(len(clients),1))
+        futures = {pool.submit(self.request_client,client): client
+                   for client in clients}
+        done, pending = wait(futures,timeout=self.deadline)
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+        for future, client in futures.items():
+            if future in pending:
+                self.client_failed(client,f"no answer in {self.deadline}s")
+            elif future.exception() is not None:
+                self.client_failed(client,repr(future.exception()))
+        return self.iter_results(futures, pending)
+
+    def iter_results(self, futures, pending):
+        """ Yield the torrents of every client that answered in time. """
+        for future, client in futures.items():
+            if future in pending or future.exception() is not None:
+                continue
+            self.dbug_out(f"{client} request successfull")
+            for item in future.result():
+                item["timestamp"] = self.timestamp
+                item["client"] = client
+                if item.get("upspeed") or item.get("dlspeed"):
+                    self.busy_clients.add(client)
+                yield item
+
+    def request_client(self,client):
+        if not self.clients[client]["url"]:
+            raise ConfigurationError(f"No url configured for {client}")
+        if self.sync:
+            return self.make_client_sync_requests(client)
+        return self.make_client_requests(client)
+
+    def client_failed(self,client,reason):
+        self.failed_clients[client] = reason
+        logger.warning("%s request failed: %s",client,reason)
+        self.dbug_out(f"Error: {client} request failed: {reason}")
+
+    def query_last_rows(self,client):
+        """ The client's `latest` rows keyed by hash. """
+        rows = self.select_data_where("static.client",client,table="latest")
+        return {row["hash"] : row for row in rows}
+
+    def compare(self,item,last_rows):
+        if item["hash"] not in last_rows: return False
+        for field in self.tracked_fields:
+            if item[field] != last_rows[item["hash"]][field]:
+                return False
+        return True
+
+    def load_written_rows(self,client):
+        """ Last row written to `data` for each of the client's torrents. """
+        if client not in self.written_rows:
+            self.written_rows[client] = self.query_last_rows(client)
+        return self.written_rows[client]
+
+    def unchanged(self,torrent):
+        """ True when `torrent` can be skipped in change only mode.
+
+            A torrent is skipped while none of the tracked counters moved
+            since its last written row, unless that row is older than the
+            heartbeat interval.
+        """
+        last_rows = self.load_written_rows(torrent["client"])
+        if not self.compare(torrent,last_rows):
+            return False
+        last_stamp = last_rows[torrent["hash"]]["timestamp"]
+        return last_stamp > self.heartbeat_stamp
+
+    def remember(self,row):
+        """ Record `row` as the torrent's last written row.
+
+            The upload and download since the previous row are queued in
+            `self.samples` for the rollup tables.
+        """
+        rows = self.load_written_rows(row["client"])
+        last = rows.get(row["hash"])
+        uploaded, downloaded = 0, 0
+        if last is not None:
+            uploaded = max(row["uploaded"] - last["uploaded"], 0)
+            downloaded = max(row["downloaded"] - last["downloaded"], 0)
+        self.samples.append((row["client"], row["hash"], row["timestamp"],
+                             uploaded, downloaded, row["ratio"],
+                             row["num_seeds"], row["num_leechs"]))
+        rows[row["hash"]] = row
+
+    def save_rollups(self):
+        """ Add the queued samples to the hourly and daily rollup tables. """
+        if not self.samples:
+            return
+        columns = ("torrent_id, bucket, uploaded, downloaded, ratio, "
+                   "seeds_sum, leechs_sum, samples")
+        updates = ("uploaded = uploaded + excluded.uploaded, "
+                   "downloaded = downloaded + excluded.downloaded, "
+                   "ratio = MAX(ratio, excluded.ratio), "
+                   "seeds_sum = seeds_sum + excluded.seeds_sum, "
+                   "leechs_sum = leechs_sum + excluded.leechs_sum, "
+                   "samples = samples + 1")
+        params = ", ".join("?" for i in range(8))
+        for table, size in ROLLUPS.items():
+            values = []
+            for client, hash, ts, ul, dl, ratio, seeds, leechs in self.samples:
+                torrent_id = self.load_static(client)[hash]["id"]
+                values.append((torrent_id, ts - ts % size, ul, dl, ratio,
+                               seeds, leechs, 1))
+            self.upsert_many_to_db(columns, values, params, table,
+                                   "torrent_id, bucket", updates)
+        self.samples = []
+        return
+
+
+    def query_data(self,client,hash):
+        row = self.load_static(client).get(hash)
+        if row is None: return False
+        rows = self.select_data_where("latest.torrent_id",row["id"],
+                                      table="latest")
+        if not rows: return False
+        return rows[0]
+
+    def check_path(self):
+        if os.path.isfile(self.path):
+            return self.table_exists("static")
+        return False
+
+    def format_data(self, data):
+        """ Write a poll's torrents `ingest_batch_size` at a time.
+
+            `data` can be any iterable and is consumed in chunks. Each chunk
+            goes through `filter_new` and is written before the next one is
+            read, all inside one transaction.
+        """
+        self.dbug_out("Saving filtered data to Database.")
+        data = iter(data)
+        with self.poll_transaction():
+            while True:
+                chunk = list(islice(data, self.ingest_batch_size))
+                if not chunk:
+                    break
+                values = [self.get_data_values(row)
+                          for row in self.filter_new(chunk)]
+                self.save_data(values)
+                self.mark_seen(chunk)
+                self.save_rollups()
+        return
+
+    @contextmanager
+    def poll_transaction(self):
+        """ Transaction that drops the cached static rows, written rows
+            and queued rollup samples if it fails, since a rollback can
+            undo the rows they describe.
+        """
+        try:
+            with self.connection.transaction():
+                yield
+        except BaseException:
+            self.static_rows = {}
+            self.written_rows = {}
+            self.samples = []
+            raise
+
+    def save_data(self, values):
+        """ Insert `data_columns` value tuples into `data` and make them
+            the torrents' `latest` rows.
+
+            Callers hold the poll's transaction, so both tables always
+            change together.
+        """
+        if not values:
+            return
+        columns = ", ".join(self.data_columns)
+        params = ", ".join("?" for i in self.data_columns)
+        self.save_many_to_db(columns, values, params, "data")
+        updates = ", ".join(f"{i} = excluded.{i}"
+                            for i in self.data_columns[1:])
+        updates += " WHERE excluded.ts >= latest.ts"
+        self.upsert_many_to_db(columns, values, params, "latest",
+                               "torrent_id", updates)
+        return
+
+    def mark_seen(self, torrents):
+        """ Set `latest.seen` to the poll's timestamp for every torrent the
+            client reported, whether a `data` row was written for it or not.
+        """
+        values = [(t["timestamp"], self.static_id(t)) for t in torrents]
+        with self.connection as cur:
+            cur.executemany("UPDATE latest SET seen = ? WHERE torrent_id = ?",
+                            values)
+        return
+
+    def filter_new(self, data):
+        """ Yield the data fields of torrents already stored in `static`.
+
+            The incoming batch is diffed against the cached static rows of
+            each client. New torrents, and torrents whose static details
+            changed, are saved in a single transaction once the batch has
+            been read. In change only mode torrents whose counters have
+            not moved are left out (see `unchanged`).
+        """
+        new = []
+        for torrent in data:
+            if self.torrent_exists(torrent):
+                if self.changes_only and self.unchanged(torrent):
+                    continue
+                row = self.filter_data_fields(torrent)
+                self.remember(row)
+                yield row
+                continue
+            self.remember(self.filter_data_fields(torrent))
+            new.append(torrent)
+        self.create_new_torrents(new)
+
+    def load_static(self, client):
+        """ Static rows of `client` keyed by hash, queried once and cached. """
+        if client not in self.static_rows:
+            rows = self.select_where("static","client",client)
+            self.static_rows[client] = {row["hash"]: row for row in rows}
+        return self.static_rows[client]
+
+    def torrent_exists(self,torrent):
+        row = self.load_static(torrent["client"]).get(torrent["hash"])
+        if row is None: return False
+        fields = self.static_fields
+        if len([i for i in fields if torrent[i] != row[i]]) >= 2:
+            return False
+        return True
+
+    def get_save_values(self, torrent):
+        column, values, params = [], [], []
+        for k, v in torrent.items():
+            column.append(k)
+            values.append(v)
+            params.append("?")
+        return ", ".join(column), values, ", ".join(params)
+
+    def get_many_values(self, torrents, fields):
+        """ Column string, value tuples and params for `save_many_to_db`. """
+        values = [tuple(t.get(f) for f in fields) for t in torrents]
+        params = ", ".join("?" for f in fields)
+        return ", ".join(fields), values, params
+
+    def create_new_torrent(self, torrent):
+        self.create_new_torrents([torrent])
+        return
+
+    def static_id(self, torrent):
+        return self.load_static(torrent["client"])[torrent["hash"]]["id"]
+
+    def get_data_values(self, row):
+        """ Value tuple for `self.data_columns` from a data fields dict. """
+        torrent_id = self.static_id(row)
+        counters = tuple(row.get(f) for f in self.counter_fields)
+        return (torrent_id, row["timestamp"]) + counters
+
+    def create_new_torrents(self, torrents):
+        """ Save static details and a first data row for each torrent.
+
+            Torrents already in `static` have their row updated in place so
+            they keep their id, the others are inserted and given one.
+        """
+        if not torrents:
+            return
+        with self.connection.transaction():
+            inserts = []
+            for torrent in torrents:
+                rows = self.load_static(torrent["client"])
+                row = rows.get(torrent["hash"])
+                if row is None:
+                    inserts.append(torrent)
+                    continue
+                static = self.filter_static_fields(torrent)
+                self.update_row("static", static, id=row["id"])
+                rows[torrent["hash"]] = dict(static, id=row["id"])
+            columns, values, params = self.get_many_values(inserts,
+                                                           self.static_fields)
+            if values:
+                self.save_many_to_db(columns, values, params, "static")
+            for client in {i["client"] for i in inserts}:
+                del self.static_rows[client]
+            values = [self.get_data_values(self.filter_data_fields(i))
+                      for i in torrents]
+            self.save_data(values)
+        return
+
+    def installation_script(self):
+        self.create_torrent_tables()
+        self.create_rollup_tables()
+        self.create_latest_table()
+        self.create_indexes()
+        self.set_schema_version(SCHEMA_VERSION)
+        return True
+
+    def create_torrent_tables(self):
+        stypes = {
+            "INTEGER PRIMARY KEY": {"id"},
+            "TEXT": {"client", "tracker", "hash",
+                    "category", "magnet_uri", "name",
+                    "save_path", "state", "tags"},
+            "INTEGER": {"completion_on", "added_on","total_size"}}
+        dtypes = {
+            "REAL": {"ratio"},
+            "INTEGER": {"torrent_id", "ts", "completed", "downloaded",
+                        "last_activity", "downloaded_session", "size",
+                        "num_complete", "uploaded", "uploaded_session",
+                        "upspeed", "num_incomplete", "num_leechs", "num_seeds",
+                        "dlspeed", "seen_complete", "time_active"}}
+
+        def loop_types(typ,lst):
+            for k,v in typ.items():
+                lst += [i + " " + k for i in v]
+            return lst
+
+        slst = loop_types(stypes,[])
+        self.create_db_table(", ".join(slst), "static")
+        dlst = loop_types(dtypes,[])
+        self.create_db_table(", ".join(dlst), "data")
+        self.create_db_table("ts INTEGER, client TEXT", "stamps")
+        return
+
+    def create_rollup_tables(self):
+        """ Per torrent totals for each hour and day.
+
+            `uploaded` and `downloaded` are the amounts transferred within
+            the bucket, `ratio` its highest ratio and the peer sums divided
+            by `samples` give the average number of seeds and leechers.
+        """
+        headers = ("torrent_id INTEGER, bucket INTEGER, uploaded INTEGER, "
+                   "downloaded INTEGER, ratio REAL, seeds_sum INTEGER, "
+                   "leechs_sum INTEGER, samples INTEGER, "
+                   "PRIMARY KEY (torrent_id, bucket)")
+        for table in ROLLUPS:
+            self.create_db_table(headers, table)
+        return
+
+    def create_latest_table(self):
+        """ The newest `data` row of every torrent, kept up to date by
+            `save_data`, and in `seen` the last poll that reported it.
+        """
+        counters = ", ".join(f"{i} REAL" if i == "ratio" else f"{i} INTEGER"
+                             for i in self.counter_fields)
+        headers = (f"torrent_id INTEGER PRIMARY KEY, ts INTEGER, "
+                   f"{counters}, seen INTEGER")
+        self.create_db_table(headers, "latest")
+        return
+
+    def create_indexes(self):
+        self.create_db_index("static_client_hash", "static",
+                             "client, hash", unique=True)
+        self.create_db_index("data_torrent_stamp", "data", "torrent_id, ts")
+        self.create_db_index("stamps_ts", "stamps", "ts")
+        self.create_db_index("stamps_client_ts", "stamps", "client, ts")
+        if "seen" in self.table_columns("latest"):
+            self.create_db_index("latest_seen", "latest", "seen")
+        return
+
+    def migrate(self):
+        """ Bring databases created by earlier versions up to date.
+
+            Each `migrate_v*` step moves the database up one schema version,
+            then any missing indexes are created. Safe to run on every
+            start.
+        """
+        if self.migrated:
+            return
+        migrations = {1: self.migrate_v1, 2: self.migrate_v2,
+                      3: self.migrate_v3, 4: self.migrate_v4,
+                      5: self.migrate_v5}
+        version = self.get_schema_version()
+        while version < SCHEMA_VERSION:
+            migrations[version + 1]()
+            version = self.get_schema_version()
+        self.create_indexes()
+        self.migrated = True
+        return
+
+    def migrate_v1(self):
+        """ Replace client, hash and ISO timestamp text in `data` and
+            `stamps` with the torrent's static id and epoch seconds.
+        """
+        self.dbug_out("Migrating database to schema version 1.")
+        static = ", ".join(self.static_fields)
+        counters = ", ".join(self.counter_fields)
+        old_counters = ", ".join("data_v0." + i for i in self.counter_fields)
+        epoch = "CAST(strftime('%s', {}, 'utc') AS INTEGER)"
+        with self.connection.transaction():
+            with self.connection as cur:
+                cur.execute("DELETE FROM static WHERE rowid NOT IN "
+                            "(SELECT MAX(rowid) FROM static "
+                            "GROUP BY client, hash)")
+                for index in ("static_client_hash", "data_client_hash_stamp",
+                              "data_hash_stamp"):
+                    cur.execute(f"DROP INDEX IF EXISTS {index}")
+                for table in ("static", "data", "stamps"):
+                    cur.execute(f"ALTER TABLE {table} RENAME TO {table}_v0")
+            self.create_torrent_tables()
+            self.create_indexes()
+            with self.connection as cur:
+                cur.execute(f"INSERT INTO static ({static}) "
+                            f"SELECT {static} FROM static_v0")
+                cur.execute("INSERT OR IGNORE INTO static (client, hash) "
+                            "SELECT DISTINCT client, hash FROM data_v0")
+                cur.execute(f"INSERT INTO data (torrent_id, ts, {counters}) "
+                            f"SELECT static.id, "
+                            f"{epoch.format('data_v0.timestamp')}, "
+                            f"{old_counters} FROM data_v0 JOIN static "
+                            f"ON static.client == data_v0.client "
+                            f"AND static.hash == data_v0.hash")
+                cur.execute(f"INSERT INTO stamps (ts) "
+                            f"SELECT {epoch.format('timestamp')} "
+                            f"FROM stamps_v0")
+                for table in ("static", "data", "stamps"):
+                    cur.execute(f"DROP TABLE {table}_v0")
+            self.set_schema_version(1)
+        return
+
+    def migrate_v2(self):
+        """ Add the rollup tables and fill them from the stored history. """
+        self.dbug_out("Migrating database to schema version 2.")
+        with self.connection.transaction():
+            self.create_rollup_tables()
+            with self.connection as cur:
+                for table, size in ROLLUPS.items():
+                    cur.execute(
+                        f"INSERT INTO {table} (torrent_id, bucket, uploaded, "
+                        f"downloaded, ratio, seeds_sum, leechs_sum, samples) "
+                        f"SELECT torrent_id, ts - ts % {size}, "
+                        f"SUM(MAX(ul, 0)), SUM(MAX(dl, 0)), MAX(ratio), "
+                        f"SUM(num_seeds), SUM(num_leechs), COUNT(*) FROM "
+                        f"(SELECT torrent_id, ts, ratio, num_seeds, "
+                        f"num_leechs, "
+                        f"COALESCE(uploaded - LAG(uploaded) OVER w, 0) AS ul, "
+                        f"COALESCE(downloaded - LAG(downloaded) OVER w, 0) "
+                        f"AS dl FROM data WINDOW w AS "
+                        f"(PARTITION BY torrent_id ORDER BY ts)) "
+                        f"GROUP BY torrent_id, ts - ts % {size}")
+            self.set_schema_version(2)
+        return
+
+    def migrate_v3(self):
+        """ Add the `latest` table, filled from each torrent's newest row. """
+        self.dbug_out("Migrating database to schema version 3.")
+        columns = ", ".join(self.data_columns[2:])
+        with self.connection.transaction():
+            self.create_latest_table()
+            with self.connection as cur:
+                cur.execute(f"INSERT INTO latest (torrent_id, ts, {columns}) "
+                            f"SELECT torrent_id, MAX(ts), {columns} "
+                            f"FROM data GROUP BY torrent_id")
+            self.set_schema_version(3)
+        return
+
+    def migrate_v4(self):
+        """ Record which client each stamp belongs to.
+
+            Clients are polled on their own schedules from this version
+            on. Older stamps covered every client and are copied once for
+            each of them.
+        """
+        self.dbug_out("Migrating database to schema version 4.")
+        with self.connection.transaction():
+            with self.connection as cur:
+                if "client" not in self.table_columns("stamps"):
+                    cur.execute("ALTER TABLE stamps ADD COLUMN client TEXT")
+                cur.execute("INSERT INTO stamps (ts, client) "
+                            "SELECT stamps.ts, clients.client FROM stamps "
+                            "CROSS JOIN (SELECT DISTINCT client FROM static) "
+                            "AS clients WHERE stamps.client IS NULL")
+                cur.execute("DELETE FROM stamps WHERE client IS NULL")
+            self.set_schema_version(4)
+        return
+
+    def migrate_v5(self):
+        """ Track the last poll that reported each torrent in
+            `latest.seen`, starting from its newest written row.
+        """
+        self.dbug_out("Migrating database to schema version 5.")
+        with self.connection.transaction():
+            with self.connection as cur:
+                if "seen" not in self.table_columns("latest"):
+                    cur.execute("ALTER TABLE latest ADD COLUMN seen INTEGER")
+                cur.execute("UPDATE latest SET seen = ts WHERE seen IS NULL")
+                cur.execute("DROP INDEX IF EXISTS latest_ts")
+            self.set_schema_version(5)
+        return
@@ -0,0 +1,92 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtGui import QPainter
+
+
+class ChartTab(QWidget):
+    """ Tab page holding one chart that is refilled for every torrent.
+
+        The QChartView and its chart are created the first time the tab
+        is drawn and kept from then on.
+    """
+    def __init__(self,name,parent=None):
+        super().__init__(parent=parent)
+        self.name = name
+        self.view = None
+        self.chart = None
+        self.stale = True
+        self.vLayout = QVBoxLayout(self)
+        self.vLayout.setContentsMargins(0,0,0,0)
+        self.setLayout(self.vLayout)
+
+    def set_chart(self,chart):
+        if self.view is None:
+            from PyQt5.QtChart import QChartView
+            self.view = QChartView(parent=self)
+            self.view.setRenderHint(QPainter.Antialiasing)
+            self.vLayout.addWidget(self.view)
+        old = self.view.chart()
+        self.view.setChart(chart)
+        old.deleteLater()
+        self.chart = chart
+        return
+
+    def draw(self,source):
+        """ Refills the chart with `source`, creating it on first use. """
+        factory = source.factory
+        if self.chart is None:
+            self.set_chart(factory.form_chart(source.series(self.name)))
+        factory.update_chart(self.chart,source.points(self.name,self.width()))
+        self.stale = False
+        return
+
+
+class ChartSource:
+    """ Rows behind the charts of the selected torrent.
+
+        Each chart is built on request, and the bar data, upload deltas and
+        rollup rows are computed once and shared between tabs.
+    """
+    def __init__(self,factory,db_rows,rollup=None):
+        self.factory = factory
+        self.db_rows = db_rows
+        self.rollup = rollup
+        self._bars = None
+        self._diffs = None
+
+    @property
+    def bars(self):
+        if self._bars is None:
+            self._bars = self.factory.bar_data(self.db_rows)
+        return self._bars
+
+    @property
+    def diffs(self):
+        if self._diffs is None:
+            self._diffs = self.factory.diff_columns(self.db_rows)
+        return self._diffs
+
+    def get_rollup(self):
+        if callable(self.rollup):
+            self.rollup = self.rollup()
+        return self.rollup
+
+    def prepare(self):
+        """ Computes the shared chart data ahead of drawing. """
+        if self.get_rollup() is None:
+            self.diffs
+        return self.bars
+
+    def series(self,name):
+        """ New, empty series of the type chart `name` is drawn with. """
+        from PyQt5.QtChart import QBarSeries, QLineSeries
+        return QLineSeries() if name == "line" else QBarSeries()
+
+    def points(self,name,width=None):
+        """ Points of chart `name`, downsampled to fit `width` pixels. """
+        if name == "line":
+            rollup = self.get_rollup()
+            diffs = self.diffs if rollup is None else None
+            return self.factory.line_points(self.db_rows,rollup,width,diffs)
+        if name == "ratio":
+            return self.factory.ratio_points(self.bars,width)
+        return self.factory.upload_points(self.bars,width)
@@ -0,0 +1,85 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from qtc.widgets.charts import ChartSource
+from qtc.widgets.tables import DataModel
+
+
+class Details:
+    """ Everything the window shows for one torrent, ready to hand to the
+        models.
+    """
+    def __init__(self,client,t_hash,static_rows,columns,source):
+        self.client = client
+        self.t_hash = t_hash
+        self.static_rows = static_rows
+        self.columns = columns
+        self.source = source
+
+
+class LoaderSignals(QObject):
+    loaded = pyqtSignal(int,object)
+    failed = pyqtSignal(int,str)
+
+
+class DetailTask(QRunnable):
+    """ Queries and preprocesses one torrent on a pool thread.
+
+        The task gives up between steps once a newer request was made.
+    """
+    def __init__(self,request_id,loader,client,t_hash):
+        super().__init__()
+        self.request_id = request_id
+        self.loader = loader
+        self.client = client
+        self.t_hash = t_hash
+
+    def stale(self):
+        return self.loader.stale(self.request_id)
+
+    def run(self):
+        session = self.loader.session
+        try:
+            if self.stale(): return
+            db_rows = session.get_data_rows(self.t_hash,self.client)
+            if self.stale(): return
+            static_rows = session.get_static_rows(self.t_hash,self.client)
+            columns = DataModel.to_columns(db_rows,session.data_fields)
+            if self.stale(): return
+            rollup = session.get_rollup_rows(self.t_hash,self.client,db_rows)
+            source = ChartSource(session.factory,db_rows,rollup)
+            source.prepare()
+            details = Details(self.client,self.t_hash,static_rows,
+                              columns,source)
+        except Exception as e:
+            self.loader.signals.failed.emit(self.request_id,str(e))
+            return
+        self.loader.signals.loaded.emit(self.request_id,details)
+
+
+class DetailLoader(QObject):
+    """ Loads torrent details off the GUI thread.
+
+        Only the latest request matters: queued tasks are dropped when a
+        new one arrives, and results of older requests are ignored.
+    """
+    max_threads = 2
+
+    def __init__(self,session,parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.request_id = 0
+        self.signals = LoaderSignals()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.max_threads)
+
+    def request(self,client,t_hash):
+        self.request_id += 1
+        self.pool.clear()
+        task = DetailTask(self.request_id,self,client,t_hash)
+        self.pool.start(task)
+        return self.request_id
+
+    def stale(self,request_id):
+        return request_id != self.request_id
+
+    def wait(self,msecs=-1):
+        return self.pool.waitForDone(msecs)
@@ -1,10 +1,14 @@
 from PyQt5.QtWidgets import QMenuBar, QMenu, QAction
+from PyQt5.QtCore import QTimer
 
 class MenuBar(QMenuBar):
+    refresh_interval = 30_000
+
     def __init__(self,parent=None):
         super().__init__(parent=parent)
         self.setObjectName(u"menubar")
         self.window = parent
+        self.filter_on = False
 
     def assign(self,session,window):
         self.session = session
@@ -14,6 +18,9 @@ class MenuBar(QMenuBar):
         self.tree = window.tree
         self.active_hashes = self.session.get_active_hashes()
         self.add_menus()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_active)
+        self.refresh_timer.start(self.refresh_interval)
 
     def add_menus(self):
         self.add_file_menu()
@@ -73,9 +80,21 @@ class MenuBar(QMenuBar):
 
 
     def filter_active_torrents(self,x=True):
+        self.filter_on = x
         self.tree.filter_active(self.active_hashes,x)
         return
 
+    def refresh_active(self):
+        """ Picks up the active torrents of polls stored since the last
+            check and reapplies the filter when it is on.
+        """
+        active_hashes = self.session.get_active_hashes()
+        if active_hashes == self.active_hashes: return
+        self.active_hashes = active_hashes
+        if self.filter_on:
+            self.tree.filter_active(active_hashes,True)
+        return
+
     def open_settings(self):
         self.window.open_settings()
 
@@ -0,0 +1,208 @@
+from PyQt5.QtWidgets import QTableView
+from PyQt5.QtGui import QStandardItem, QStandardItemModel
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+class TableView(QTableView):
+    def __init__(self, parent=None, model_class=None):
+        super().__init__(parent=parent)
+        self.window = parent
+        self.model_class = model_class or ItemModel
+        self.checks = []
+        self.setShowGrid(True)
+
+
+    def assign(self,session,window):
+        self.window = window
+        self.session = session
+        self.menubar = window.menubar
+        self.itemModel = self.model_class(parent=self)
+        self.itemModel.setSession(self.session)
+        self.setModel(self.itemModel)
+        return
+
+    def get_columns(self):
+        col = self.itemModel.col_map
+        return col
+
+    def get_rows(self):
+        row = self.itemModel.row_map
+        return row
+
+    def check_menus(self):
+        for field,idx in self.checks:
+            self.hideColumn(idx)
+        return
+
+class ItemModel(QStandardItemModel):
+    def __init__(self,parent=None):
+        super().__init__(parent=None)
+        self.view = parent
+        self.row_count = 0
+        self.flags = (Qt.ItemIsSelectable|Qt.ItemIsEnabled)
+        self.chartView = None
+
+    def setSession(self,session):
+        self.session = session
+        self.window = session.win
+        self.row_map = session.static_fields
+        self.col_map = session.data_fields
+        return
+
+    def receive_static(self,data):
+        self.isEmpty()
+        row = data[0]
+        self.setColumnCount(1)
+        self.setRowCount(len(row))
+        headers = self.session.get_headers(self.row_map)
+        self.setVerticalHeaderLabels(headers)
+        for field in self.row_map:
+            item = self.session.gen_items(field,row[field])
+            self.setItem(self.row_count,0,item)
+            self.row_count += 1
+        self.view.resizeColumnsToContents()
+        return
+
+    def receive_table(self,data):
+        self.isEmpty()
+        self.setColumnCount(len(self.col_map))
+        self.setRowCount(len(data))
+        headers = self.session.get_headers(self.col_map)
+        self.setHorizontalHeaderLabels(headers)
+        for x,row in enumerate(data):
+            for y,field in enumerate(self.col_map):
+                item = self.session.gen_items(field,row[field])
+                self.setItem(x,y,item)
+            self.row_count += 1
+        self.view.check_menus()
+        return
+
+    def isEmpty(self):
+        self.clear()
+        indeces = list(range(self.row_count))
+        for idx in indeces[::-1]:
+            item = self.takeRow(idx)
+            del item
+            self.row_count -= 1
+        return True
+
+
+class DataModel(QAbstractTableModel):
+    """ Read only model for the data table.
+
+        Rows are kept as one list of raw values per column. Cells are
+        formatted when the view first asks for them, a block of
+        `fetch_size` rows of a column at a time, and the strings are kept
+        until the next reset. Rows are handed to the view `fetch_size` at a
+        time through canFetchMore/fetchMore.
+    """
+    fetch_size = 256
+
+    def __init__(self,parent=None):
+        super().__init__(parent=None)
+        self.view = parent
+        self.columns = []
+        self.display = {}
+        self.headers = []
+        self.total = 0
+        self.loaded = 0
+        self.flags_ = (Qt.ItemIsSelectable|Qt.ItemIsEnabled)
+
+    def setSession(self,session):
+        self.session = session
+        self.window = session.win
+        self.row_map = session.static_fields
+        self.col_map = session.data_fields
+        self.headers = session.get_headers(self.col_map)
+        return
+
+    @staticmethod
+    def to_columns(data,fields):
+        """ One list of raw values per field; safe to call off the GUI
+            thread.
+        """
+        return [[row[field] for row in data] for field in fields]
+
+    def receive_table(self,data):
+        self.receive_columns(self.to_columns(data,self.col_map))
+        return
+
+    def receive_columns(self,columns):
+        self.beginResetModel()
+        self.columns = columns
+        self.display = {}
+        self.total = len(columns[0]) if columns else 0
+        self.loaded = min(self.total,self.fetch_size)
+        self.endResetModel()
+        self.view.check_menus()
+        return
+
+    def rowCount(self,parent=QModelIndex()):
+        if parent.isValid(): return 0
+        return self.loaded
+
+    def columnCount(self,parent=QModelIndex()):
+        if parent.isValid(): return 0
+        return len(self.col_map)
+
+    def canFetchMore(self,parent=QModelIndex()):
+        if parent.isValid(): return False
+        return self.loaded < self.total
+
+    def fetchMore(self,parent=QModelIndex()):
+        if parent.isValid(): return
+        count = min(self.total - self.loaded,self.fetch_size)
+        if count <= 0: return
+        self.beginInsertRows(QModelIndex(),self.loaded,self.loaded+count-1)
+        self.loaded += count
+        self.endInsertRows()
+        return
+
+    def value(self,row,column):
+        return self.columns[column][row]
+
+    def display_value(self,row,column):
+        block, offset = divmod(row,self.fetch_size)
+        key = (column,block)
+        if key not in self.display:
+            start = block * self.fetch_size
+            values = self.columns[column][start:start+self.fetch_size]
+            field = self.col_map[column]
+            self.display[key] = self.session.format_column(field,values)
+        return self.display[key][offset]
+
+    def data(self,index,role=Qt.DisplayRole):
+        if not index.isValid(): return QVariant()
+        if role == Qt.DisplayRole:
+            return self.display_value(index.row(),index.column())
+        if role == Qt.UserRole:
+            return self.value(index.row(),index.column())
+        return QVariant()
+
+    def headerData(self,section,orientation,role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section,orientation,role)
+
+    def flags(self,index):
+        return self.flags_
+
+
+class StandardItem(QStandardItem):
+    def __init__(self,txt):
+        super().__init__(txt)
+        self.display_value = txt
+        self.value = None
+        self.label = None
+        self.field = None
+
+    def set_label(self,arg):
+        self.label = arg
+
+    def set_display_value(self,arg):
+        self.display_value = arg
+
+    def set_value(self,arg):
+        self.value = arg
+
+    def set_field(self,arg):
+        self.field = arg
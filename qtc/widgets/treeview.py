@@ -0,0 +1,208 @@
+from PyQt5.QtWidgets import QTreeView
+from PyQt5.QtCore import (Qt, QAbstractItemModel, QModelIndex, QVariant,
+                          QSortFilterProxyModel)
+from qtc.widgets.fonts import Cambria, Dubai
+from qtc.widgets.loader import DetailLoader
+
+
+class TreeView(QTreeView):
+    stylesheet = ""
+    def __init__(self,parent=None):
+        super().__init__(parent=parent)
+        self.setAlternatingRowColors(True)
+        self.setAnimated(True)
+        self.setStyleSheet("margin-top: 10px; margin-bottom: 10px;")
+        self.setIndentation(18)
+        self.setUniformRowHeights(True)
+        self.setHeaderHidden(True)
+        self.active_filter = None
+
+    def assign(self,session=None,window=None):
+        self.session = session
+        self.window = window
+        self.table = window.dataTable
+        self.static = window.staticTable
+        self.treeModel = TreeModel(session,parent=self)
+        self.proxy = TreeProxy(parent=self)
+        self.proxy.setSourceModel(self.treeModel)
+        self.setModel(self.proxy)
+        self.loader = DetailLoader(session,parent=self)
+        self.loader.signals.loaded.connect(self.show_details)
+        self.loader.signals.failed.connect(self.show_error)
+        selection = self.selectionModel()
+        selection.currentChanged.connect(self.display_info)
+        return
+
+    def display_info(self,current=None,previous=None):
+        """ Queues the selected torrent; `show_details` fills the tables
+            and charts once it has loaded.
+        """
+        index = current if current is not None else self.currentIndex()
+        node = self.treeModel.torrent(self.proxy.mapToSource(index))
+        if node is None: return
+        client,t_hash = node
+        self.loader.request(client,t_hash)
+        return
+
+    def show_details(self,request_id,details):
+        if self.loader.stale(request_id): return
+        staticModel,dataModel = self.static.itemModel,self.table.itemModel
+        staticModel.receive_static(details.static_rows)
+        dataModel.receive_columns(details.columns)
+        self.window.torrent_charts(details.source)
+        return
+
+    def show_error(self,request_id,message):
+        if self.loader.stale(request_id): return
+        self.window.statusBar().showMessage(message)
+        return
+
+    def sort_top_items(self,field):
+        self.treeModel.set_sort_field(field)
+        self.proxy.invalidate()
+        self.proxy.sort(0)
+        return
+
+    def filter_active(self,active_hashes,x):
+        self.proxy.set_active_filter(active_hashes,x)
+        return
+
+
+class TreeProxy(QSortFilterProxyModel):
+    """ Sorts torrents by the model's SortRole and applies the
+        "Active Only" filter. Clients keep their order.
+    """
+    def __init__(self,parent=None):
+        super().__init__(parent)
+        self.setSortRole(TreeModel.SortRole)
+        self.active_hashes = None
+        self.hide_active = False
+
+    def set_active_filter(self,active_hashes,x):
+        self.active_hashes = set(active_hashes)
+        self.hide_active = x
+        self.invalidateFilter()
+        return
+
+    def filterAcceptsRow(self,row,parent):
+        if not self.hide_active or not parent.isValid():
+            return True
+        index = self.sourceModel().index(row,0,parent)
+        return self.sourceModel().torrent(index)[1] not in self.active_hashes
+
+    def lessThan(self,left,right):
+        """ Compared in Python; Qt's QVariant ordering mixes up int and
+            qlonglong values above 2**31.
+        """
+        if not left.parent().isValid():
+            return left.row() < right.row()
+        role = self.sortRole()
+        return left.data(role) < right.data(role)
+
+
+class TreeModel(QAbstractItemModel):
+    """ Clients at the top level with their torrents below them.
+
+        A client's torrents are queried the first time its node is
+        expanded and kept as a list of (hash, name) tuples. Top level
+        indexes have an internal id of 0, torrents carry their client's
+        row plus one.
+    """
+    SortRole = Qt.UserRole
+
+    def __init__(self,session,parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.clients = session.get_client_names()
+        self.children = [None for _ in self.clients]
+        self.sort_field = None
+        self.sort_values = {}
+        self.top_font = Cambria()
+        self.child_font = Dubai()
+
+    def index(self,row,column,parent=QModelIndex()):
+        if not self.hasIndex(row,column,parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row,column,0)
+        return self.createIndex(row,column,parent.row()+1)
+
+    def parent(self,index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId()-1,0,0)
+
+    def rowCount(self,parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.clients)
+        if parent.internalId() != 0:
+            return 0
+        return len(self.children[parent.row()] or ())
+
+    def columnCount(self,parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self,parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.clients)
+        return parent.internalId() == 0
+
+    def canFetchMore(self,parent):
+        if not parent.isValid() or parent.internalId() != 0:
+            return False
+        return self.children[parent.row()] is None
+
+    def fetchMore(self,parent):
+        if not self.canFetchMore(parent): return
+        client = self.clients[parent.row()]
+        rows = self.session.get_torrent_names(client)
+        children = [(row["hash"],row["name"]) for row in rows]
+        self.children[parent.row()] = []
+        if not children: return
+        self.beginInsertRows(parent,0,len(children)-1)
+        self.children[parent.row()] = children
+        self.endInsertRows()
+        return
+
+    def data(self,index,role=Qt.DisplayRole):
+        if not index.isValid(): return QVariant()
+        top = index.internalId() == 0
+        if role == Qt.DisplayRole:
+            if top:
+                return self.clients[index.row()]
+            return self.children[index.internalId()-1][index.row()][1]
+        if role == Qt.FontRole:
+            return self.top_font if top else self.child_font
+        if role == self.SortRole and not top:
+            return self.sort_value(index)
+        return QVariant()
+
+    def flags(self,index):
+        return Qt.ItemIsSelectable|Qt.ItemIsEnabled
+
+    def torrent(self,index):
+        """ (client, hash) of a torrent index, None for client nodes. """
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        client_row = index.internalId()-1
+        t_hash = self.children[client_row][index.row()][0]
+        return self.clients[client_row], t_hash
+
+    def set_sort_field(self,field):
+        self.sort_field = field
+        self.sort_values = {}
+        return
+
+    def sort_value(self,index):
+        """ Latest `sort_field` value of a torrent, queried once per
+            client.
+        """
+        if self.sort_field is None:
+            return index.row()
+        client_row = index.internalId()-1
+        if client_row not in self.sort_values:
+            client = self.clients[client_row]
+            track = self.session.get_top_rows(client,self.sort_field)
+            self.sort_values[client_row] = track
+        t_hash = self.children[client_row][index.row()][0]
+        return self.sort_values[client_row].get(t_hash) or 0
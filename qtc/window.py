@@ -33,16 +33,15 @@
 
 import sys
 from PyQt5.QtCore import QSize, Qt, QMetaObject
-from PyQt5.QtGui import QPainter
 from PyQt5.QtWidgets import (QApplication, QHBoxLayout, QMenu,
                              QMenuBar, QStatusBar, QMainWindow,
                              QVBoxLayout, QWidget, QSplitter,
                              QTabWidget, QAction, QGraphicsWidget)
 
-from PyQt5.QtChart import QChart, QChartView, QScatterSeries
-
-from qtc.widgets.treeview import ChildTreeItem, TopTreeItem, TreeWidget
-from qtc.widgets.tables import ItemModel, StandardItem, TableView
+from qtc.widgets.charts import ChartTab
+from qtc.widgets.treeview import TreeView
+from qtc.widgets.tables import (ItemModel, DataModel, StandardItem,
+                               TableView)
 from qtc.widgets.menubar import MenuBar
 from qtc.widgets.settings_menu import SettingsMenu
 from qtc.widgets.fonts import Cambria, Niagara, Dubai
@@ -57,7 +56,7 @@ class Win(QMainWindow):
         self.setWindowTitle("Torrent Companion")
         self.resize(1400, 800)
         self.hSplitter = QSplitter()
-        self.tree = TreeWidget(parent=self.hSplitter)
+        self.tree = TreeView(parent=self.hSplitter)
         self.hSplitter.addWidget(self.tree)
         self.tables = QWidget(self.hSplitter)
         self.hLayout = QHBoxLayout(self.tables)
@@ -69,7 +68,7 @@ class Win(QMainWindow):
         self.staticTable = TableView(self.vSplitter)
         self.vSplitter.addWidget(self.staticTable)
         self.tabs = QTabWidget(parent=self.vSplitter)
-        self.dataTable = TableView(self.tabs)
+        self.dataTable = TableView(self.tabs,model_class=DataModel)
         self.tabs.addTab(self.dataTable,"data")
         self.hSplitter.setStretchFactor(1,4)
         self.vSplitter.addWidget(self.tabs)
@@ -83,21 +82,31 @@ class Win(QMainWindow):
         QMetaObject.connectSlotsByName(self)
 
     def add_chart_tabs(self):
-        self.ulChart = QChartView(parent=self.tabs)
-        self.ratioChart = QChartView(parent=self.tabs)
-        self.lineChart = QChartView(parent=self.tabs)
-        self.ulChart.setRenderHint(QPainter.Antialiasing)
-        self.ratioChart.setRenderHint(QPainter.Antialiasing)
-        self.lineChart.setRenderHint(QPainter.Antialiasing)
+        self.chart_source = None
+        self.ulChart = ChartTab("upload",parent=self.tabs)
+        self.ratioChart = ChartTab("ratio",parent=self.tabs)
+        self.lineChart = ChartTab("line",parent=self.tabs)
         self.tabs.addTab(self.lineChart,"Line Chart")
         self.tabs.addTab(self.ratioChart,"Ratio Chart")
         self.tabs.addTab(self.ulChart,"Uploaded Chart")
+        self.tabs.currentChanged.connect(self.draw_chart)
+        return
+
+    def torrent_charts(self,source):
+        """ Charts for `source` are drawn as their tabs are shown, reusing
+            the chart each tab already holds.
+        """
+        self.chart_source = source
+        for tab in (self.ulChart,self.ratioChart,self.lineChart):
+            tab.stale = True
+        self.draw_chart()
         return
 
-    def torrent_charts(self,upload_chart,ratio_chart,line_chart):
-        self.ulChart.setChart(upload_chart)
-        self.ratioChart.setChart(ratio_chart)
-        self.lineChart.setChart(line_chart)
+    def draw_chart(self,index=None):
+        tab = self.tabs.currentWidget()
+        if not isinstance(tab,ChartTab) or not tab.stale: return
+        if self.chart_source is None: return
+        tab.draw(self.chart_source)
         return
 
     def open_settings(self):
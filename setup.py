@@ -8,7 +8,7 @@ with open('README.md') as readme_file:
 with open('HISTORY.md') as history_file:
     history = history_file.read()
 
-requirements = ["PyQt5", "PyQt5-sip","requests","urllib3","PyQtChart"]
+requirements = ["PyQt5", "PyQt5-sip","requests","urllib3","PyQtChart","numpy"]
 setup(
     author="AlexpDev",
     author_email='alexpdev@protonmail.com',
@@ -23,14 +23,15 @@ setup(
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ],
-    entry_points={'console_scripts':['Qtc=Qtc.bin.Qtc_:main']},
+    entry_points={'console_scripts':['Qtc=qtc.bin.Qtc_:main',
+                                    'Qtc-collect=qtc.bin.collect:main']},
     description="GUI tool for viewing torrent stats.",
     install_requires=requirements,
     long_description=readme + '\n\n' + history,
     include_package_data=True,
     keywords='qtc',
     name='Qtc',
-    packages=find_packages(include=['Qtc', 'Qtc.*']),
+    packages=find_packages(include=['qtc', 'qtc.*']),
     test_suite='test',
     url='https://github.com/alexpdev/qtc',
     version='0.2',
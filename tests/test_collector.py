@@ -0,0 +1,138 @@
+#! /usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+######
+################################################################################
+
+
+import os
+import sys
+import subprocess
+from threading import Thread
+from unittest import TestCase
+sys.path.append(os.getcwd())
+try:
+    from tests.test_pydenv import pydenv
+    pydenv()
+    from tests._testsettings import DETAILS,DB_NAME,DATA_DIR,DEBUG
+except:
+    from tests.testsettings import DETAILS,DB_NAME,DATA_DIR,DEBUG
+
+from qtc.collector import ClientSchedule, Collector
+from qtc.bin.collect import write_pidfile
+
+
+class CountingStorage:
+    def __init__(self,fail=False):
+        self.clients = {"home" : {}, "seedbox" : {"interval" : 600}}
+        self.polls = 0
+        self.polled = []
+        self.fail = fail
+        self.messages = []
+        self.collector = None
+        self.failed_clients = {}
+        self.busy_clients = {"home"}
+
+    def log(self,clients=None):
+        self.polls += 1
+        self.polled.append(clients)
+        if self.collector:
+            self.collector.stop()
+        if self.fail:
+            raise ConnectionError
+
+    def dbug_out(self,msg):
+        self.messages.append(msg)
+
+
+class TestCollector(TestCase):
+
+    def test_no_qt_imports(self):
+        code = ("import os,sys; sys.path.append(os.getcwd()); "
+                "import qtc.bin.collect; "
+                "print(sorted(m for m in sys.modules if 'PyQt' in m))")
+        out = subprocess.run([sys.executable,"-c",code],cwd=os.getcwd(),
+                             capture_output=True,text=True,check=True)
+        self.assertEqual(out.stdout.strip(),"[]")
+
+    def test_run_once(self):
+        storage = CountingStorage()
+        collector = Collector(storage,interval=60,active_interval=10)
+        collector.run(once=True)
+        self.assertEqual(storage.polls,1)
+        self.assertEqual(storage.polled,[["home","seedbox"]])
+        schedules = collector.schedules
+        self.assertEqual(schedules["home"].step,10)
+        self.assertEqual(schedules["seedbox"].step,600)
+
+    def test_stop(self):
+        storage = CountingStorage(fail=True)
+        collector = Collector(storage,interval=60)
+        storage.collector = collector
+        thread = Thread(target=collector.run)
+        with self.assertLogs("qtc.collector","ERROR"):
+            thread.start()
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(storage.polls,1)
+        self.assertTrue(storage.messages)
+
+    def test_pidfile(self):
+        path = DATA_DIR / "collect.pid"
+        path.write_text("not a pid")
+        write_pidfile(path)
+        self.assertEqual(path.read_text(),str(os.getpid()))
+        with self.assertRaises(SystemExit):
+            write_pidfile(path)
+        path.unlink()
+
+
+class TestClientSchedule(TestCase):
+
+    def test_aligned_ticks(self):
+        schedule = ClientSchedule(60,60,3600,now=100)
+        self.assertEqual(schedule.update(now=105),160)
+        self.assertEqual(schedule.update(now=170),220)
+        self.assertEqual(schedule.update(now=400),460)
+
+    def test_backoff(self):
+        schedule = ClientSchedule(60,10,300,now=0)
+        steps = []
+        for i in range(4):
+            schedule.update(now=schedule.due,failed=True)
+            steps.append(schedule.step)
+        self.assertEqual(steps,[120,240,300,300])
+        schedule.update(now=schedule.due)
+        self.assertEqual(schedule.step,60)
+
+    def test_busy(self):
+        schedule = ClientSchedule(60,10,300,now=0)
+        self.assertEqual(schedule.update(now=1,busy=True),10)
+        self.assertEqual(schedule.update(now=11),70)
+
@@ -32,9 +32,12 @@
 
 import os
 import sys
+import subprocess
+import time
 from pathlib import Path
 from unittest import TestCase
 from datetime import datetime,timedelta
+import numpy as np
 sys.path.append(os.getcwd())
 try:
     from tests.test_pydenv import pydenv
@@ -80,3 +83,137 @@ class TestFactory(TestCase):
             self.assertIsInstance(item,QStandardItem)
             self.assertEqual(item.field,k)
             self.assertEqual(item.value,v)
+
+    def test_fill_gaps(self):
+        factory = ItemFactory()
+        rows = [{"timestamp": "b", "uploaded": 1},
+                {"timestamp": "e", "uploaded": 2}]
+        stamps = ["a", "b", "c", "d", "e", "f"]
+        filled = factory.fill_gaps(rows,stamps)
+        self.assertEqual([i["timestamp"] for i in filled],["b","c","d","e"])
+        self.assertEqual([i["uploaded"] for i in filled],[1,1,1,2])
+        filled = factory.fill_gaps(rows,stamps,"f")
+        self.assertEqual([i["timestamp"] for i in filled],
+                         ["b","c","d","e","f"])
+        self.assertEqual(filled[-1]["uploaded"],2)
+
+    def test_bar_data(self):
+        factory = ItemFactory()
+        rows = [{"timestamp": 1600000000 + i*60, "uploaded": ul, "ratio": r}
+                for i,(ul,r) in enumerate([(1,.1),(1,.1),(5,.5),(3,.3)])]
+        uls, ratios, seq, ul_top, ratio_top = factory.bar_data(rows)
+        self.assertEqual(uls,[1,1,5,3])
+        self.assertEqual(ratios,[.1,.1,.5,.3])
+        self.assertEqual(len(seq),4)
+        self.assertEqual((ul_top,ratio_top),(5,.5))
+
+    def test_pick_rollup(self):
+        factory = ItemFactory()
+        start = 1585569600
+        self.assertIsNone(factory.pick_rollup(start,start + 86400))
+        self.assertEqual(factory.pick_rollup(start,start + 3 * 86400),
+                         "hourly")
+        self.assertEqual(factory.pick_rollup(start,start + 14 * 86400),
+                         "daily")
+
+    def test_rollup_labels_utc(self):
+        factory = ItemFactory()
+        tz = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+        try:
+            rows = [{"bucket": 1585526400 + 3600 * 15, "uploaded": 1,
+                     "ratio": 1.0}]
+            title, diffs = factory.rollup_diffs("hourly",rows)
+            self.assertEqual(diffs[0][0],"03/30 (15:00)")
+            rows[0]["bucket"] = 1585526400
+            title, diffs = factory.rollup_diffs("daily",rows)
+            self.assertEqual(diffs[0][0],"03/30")
+            self.assertEqual(title,"Daily Upload (UTC)")
+        finally:
+            if tz is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = tz
+            time.tzset()
+
+    def test_diff_columns(self):
+        factory = ItemFactory()
+        rows = [{"timestamp": 1600000000 + i*60, "uploaded": ul, "ratio": r}
+                for i,(ul,r) in enumerate([(1,.1),(1,.1),(5,.5),(3,.3)])]
+        rows.reverse()
+        rows[0]["timestamp"] = datetime.fromtimestamp(
+            rows[0]["timestamp"]).isoformat()
+        secs, uls, ratios = factory.diff_columns(rows)
+        self.assertEqual(secs.dtype,np.int64)
+        self.assertEqual(secs.tolist(),[60,60])
+        self.assertEqual(uls.tolist(),[4,2])
+        self.assertEqual(ratios.round(5).tolist(),[.4,.2])
+        diffs = list(factory.calculate_diffs(rows))
+        self.assertEqual([i[0] for i in diffs],[timedelta(seconds=60)]*2)
+        self.assertEqual([len(i) for i in factory.diff_columns([])],[0,0,0])
+
+    def test_downsample(self):
+        factory = ItemFactory()
+        values = [i % 7 for i in range(1000)]
+        values[537] = 500
+        picked = factory.downsample(values,50)
+        self.assertEqual(len(picked),50)
+        self.assertEqual((picked[0],picked[-1]),(0,999))
+        self.assertEqual(picked,sorted(set(picked)))
+        self.assertIn(537,picked)
+        self.assertEqual(factory.downsample(values[:10],50),list(range(10)))
+
+    def test_max_points(self):
+        factory = ItemFactory()
+        self.assertEqual(factory.max_points(),factory.point_limit)
+        self.assertEqual(factory.max_points(600),600 // factory.point_width)
+        self.assertEqual(factory.max_points(10**6),factory.point_limit)
+        self.assertEqual(factory.max_points(0),3)
+
+    def test_no_qtchart_import(self):
+        code = ("import os,sys; sys.path.append(os.getcwd()); "
+                "import qtc.window; "
+                "print('PyQt5.QtChart' in sys.modules)")
+        out = subprocess.run([sys.executable,"-c",code],cwd=os.getcwd(),
+                             capture_output=True,text=True,check=True)
+        self.assertEqual(out.stdout.strip(),"False")
+
+    def test_format_column(self):
+        factory = ItemFactory()
+        now = datetime.now().timestamp()
+        samples = {
+            "uploaded" : [0, 999, 1001, 5466326, 1_000_000_001, None],
+            "upspeed" : [12, 123456],
+            "ratio" : [1.5634325, 0],
+            "timestamp" : [1585569600, "2020-03-30T12:00:00"],
+            "seen_complete" : [now - 90000, now - 60],
+            "time_active" : [0, 93784],
+            "hash" : ["abcd1234"],
+        }
+        for field,values in samples.items():
+            column = factory.format_column(field,values)
+            expected = [factory.format_value(field,v) if v is not None
+                        else "" for v in values]
+            if field == "seen_complete":
+                column = [i.split(".")[0] for i in column]
+                expected = [i.split(".")[0] for i in expected]
+            self.assertEqual(column,expected)
+
+    def test_format_column_tolist(self):
+        class Array(list):
+            def tolist(self):
+                return list(self)
+        factory = ItemFactory()
+        column = factory.format_column("uploaded",Array([2000,3]))
+        self.assertEqual(column,["2.0KB","3 B"])
+
+    def test_format_column_array(self):
+        factory = ItemFactory()
+        uploaded = np.array([0, 999, 1001, 5466326, 1_000_000_001])
+        self.assertEqual(factory.format_column("uploaded",uploaded),
+                         ["0 B","999 B","1.0KB","5.47MB","1.0GB"])
+        ratio = np.array([1.5634325, 0.25])
+        self.assertEqual(factory.format_column("ratio",ratio),
+                         ["1.56343","0.25"])
+
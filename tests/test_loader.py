@@ -0,0 +1,126 @@
+#! /usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+######
+################################################################################
+
+
+import os
+import sys
+from unittest import TestCase
+sys.path.append(os.getcwd())
+
+from PyQt5.QtWidgets import QApplication
+from qtc.factory import ItemFactory
+from qtc.widgets.charts import ChartSource, ChartTab
+from qtc.widgets.loader import DetailLoader
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class FakeSession:
+    data_fields = ("timestamp","uploaded","ratio")
+
+    def __init__(self,fail=False):
+        self.factory = ItemFactory()
+        self.fail = fail
+
+    def get_data_rows(self,t_hash,client):
+        if self.fail:
+            raise ValueError("no such torrent")
+        return [{"timestamp": 1600000000 + i*60, "uploaded": i,
+                 "ratio": i/10, "hash": t_hash} for i in range(10)]
+
+    def get_static_rows(self,t_hash,client):
+        return [{"hash": t_hash, "client": client}]
+
+    def get_rollup_rows(self,t_hash,client,db_rows):
+        return None
+
+
+class TestDetailLoader(TestCase):
+
+    def collect(self,loader):
+        results = []
+        loader.signals.loaded.connect(lambda *args: results.append(args))
+        loader.signals.failed.connect(lambda *args: results.append(args))
+        return results
+
+    def test_latest_request(self):
+        loader = DetailLoader(FakeSession())
+        results = self.collect(loader)
+        for t_hash in ("a","b","c"):
+            last = loader.request("qbit",t_hash)
+        loader.wait()
+        app.processEvents()
+        fresh = [i for i in results if not loader.stale(i[0])]
+        self.assertEqual(len(fresh),1)
+        request_id,details = fresh[0]
+        self.assertEqual(request_id,last)
+        self.assertEqual(details.t_hash,"c")
+        self.assertEqual(details.columns[1],list(range(10)))
+        self.assertEqual(details.source.bars[0],list(range(10)))
+
+    def test_failed(self):
+        loader = DetailLoader(FakeSession(fail=True))
+        results = self.collect(loader)
+        loader.request("qbit","a")
+        loader.wait()
+        app.processEvents()
+        self.assertEqual(results,[(1,"no such torrent")])
+
+
+class TestChartTab(TestCase):
+
+    def source(self,count):
+        rows = [{"timestamp": 1600000000 + i*60, "uploaded": i*i,
+                 "ratio": i/10, "hash": "a"} for i in range(count)]
+        return ChartSource(ItemFactory(),rows)
+
+    def test_chart_reused(self):
+        for name in ("upload","ratio","line"):
+            tab = ChartTab(name)
+            tab.draw(self.source(10))
+            chart = tab.chart
+            tab.draw(self.source(2000))
+            self.assertIs(tab.chart,chart)
+            self.assertEqual(len(chart.series()),1)
+            self.assertEqual(len(chart.axes()),2)
+            self.assertFalse(tab.stale)
+
+    def test_animation_limit(self):
+        tab = ChartTab("upload")
+        tab.resize(6000,400)
+        tab.draw(self.source(10))
+        barset = tab.chart.series()[0].barSets()[0]
+        self.assertEqual(barset.count(),10)
+        self.assertNotEqual(int(tab.chart.animationOptions()),0)
+        tab.draw(self.source(2000))
+        self.assertEqual(barset.count(),ItemFactory.point_limit)
+        self.assertEqual(int(tab.chart.animationOptions()),0)
@@ -32,7 +32,11 @@
 
 import os
 import sys
+import json
+import sqlite3
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
 from unittest import TestCase
 sys.path.append(os.getcwd())
 try:
@@ -43,7 +47,7 @@ except:
     from tests.testsettings import DETAILS,DB_NAME,DATA_DIR,DEBUG
     from tests.test_data import data
 
-from qtc.mixins import QueryMixin, SqlConnect
+from qtc.mixins import ClientConnection, QueryMixin, SqlConnect
 from tests.test_data import a
 
 class TestMixin(TestCase):
@@ -77,14 +81,15 @@ class TestMixin(TestCase):
         mixin.connection = connection
         self.assertTrue(mixin)
         self.assertEqual(mixin.path,self.path)
-        mixin.create_db_table("timestamp","stamps")
-        stamp = datetime.timestamp(datetime.now())
-        mixin.log_timestamp(stamp)
+        mixin.create_db_table("ts INTEGER, client TEXT","stamps")
+        stamp = int(datetime.timestamp(datetime.now()))
+        mixin.log_timestamp(stamp,"local")
         with connection as curs:
             r = tuple(curs.execute("SELECT * FROM stamps"))
             self.assertTrue(r)
-            self.assertIsInstance(r[0]["timestamp"],float)
-            self.assertEqual(r[0]["timestamp"],stamp)
+            self.assertIsInstance(r[0]["ts"],int)
+            self.assertEqual(r[0]["ts"],stamp)
+            self.assertEqual(r[0]["client"],"local")
 
     def test_save_to_db(self):
         mixin = QueryMixin()
@@ -112,3 +117,118 @@ class TestMixin(TestCase):
 
 
 
+
+class TestSqlConnect(TestCase):
+
+    def setUp(self):
+        self.path = DATA_DIR / DB_NAME
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.connection = SqlConnect(self.path)
+
+    def tearDown(self):
+        self.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_connection_per_thread(self):
+        first = self.connection.conn
+        self.assertIs(self.connection.conn,first)
+        other = []
+        thread = Thread(target=lambda: other.append(self.connection.conn))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0],first)
+
+    def test_transaction_scope(self):
+        with self.connection as cur:
+            cur.execute("CREATE TABLE stamps (timestamp TEXT)")
+        with self.connection.transaction():
+            with self.connection as cur:
+                cur.execute("INSERT INTO stamps VALUES ('a')")
+            self.assertTrue(self.connection.conn.in_transaction)
+        self.assertFalse(self.connection.conn.in_transaction)
+        with self.assertRaises(ValueError):
+            with self.connection.transaction():
+                with self.connection as cur:
+                    cur.execute("INSERT INTO stamps VALUES ('b')")
+                raise ValueError
+        with self.connection as cur:
+            rows = cur.execute("SELECT * FROM stamps").fetchall()
+        self.assertEqual([i["timestamp"] for i in rows],["a"])
+
+    def test_new_database_settings(self):
+        conn = self.connection.conn
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0],2)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode,"wal")
+
+    def test_reader_does_not_wait(self):
+        with self.connection as cur:
+            cur.execute("CREATE TABLE stamps (timestamp TEXT)")
+            cur.execute("INSERT INTO stamps VALUES ('a')")
+        mode = self.connection.conn.execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode[0],"wal")
+        reader = SqlConnect(self.path,readonly=True,busy_timeout=0)
+        with self.connection.transaction():
+            with self.connection as cur:
+                cur.execute("INSERT INTO stamps VALUES ('b')")
+            with reader as cur:
+                rows = cur.execute("SELECT * FROM stamps").fetchall()
+            self.assertEqual([i["timestamp"] for i in rows],["a"])
+        with self.assertRaises(sqlite3.OperationalError):
+            with reader as cur:
+                cur.execute("INSERT INTO stamps VALUES ('c')")
+        reader.close()
+
+
+class WebUIHandler(BaseHTTPRequestHandler):
+    logins = 0
+    sid = "first"
+
+    def do_GET(self):
+        if self.path.startswith("/api/v2/auth/login"):
+            WebUIHandler.logins += 1
+            self.send_response(200)
+            self.send_header("Set-Cookie","SID=" + self.sid + "; path=/")
+            self.end_headers()
+            self.wfile.write(b"Ok.")
+            return
+        if "SID=" + self.sid not in self.headers.get("Cookie",""):
+            self.send_response(403)
+            self.end_headers()
+            return
+        body = json.dumps([{"hash" : "abcd"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Length",str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self,*args):
+        pass
+
+
+class TestClientConnection(TestCase):
+
+    def setUp(self):
+        WebUIHandler.logins, WebUIHandler.sid = 0, "first"
+        self.server = HTTPServer(("127.0.0.1",0),WebUIHandler)
+        Thread(target=self.server.serve_forever,daemon=True).start()
+        url = "http://127.0.0.1:%d/api/v2" % self.server.server_port
+        self.connection = ClientConnection(url,{"username" : "admin"})
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_cookie_reused(self):
+        self.assertEqual(self.connection.get_info(),[{"hash" : "abcd"}])
+        self.assertEqual(self.connection.get_info(),[{"hash" : "abcd"}])
+        self.assertEqual(WebUIHandler.logins,1)
+
+    def test_login_on_403(self):
+        self.connection.get_info()
+        WebUIHandler.sid = "second"
+        self.assertEqual(self.connection.get_info(),[{"hash" : "abcd"}])
+        self.assertEqual(WebUIHandler.logins,2)
@@ -43,6 +43,7 @@ except:
 
 from qtc.session import BaseSession,SqlSession
 from qtc.storage import SqlStorage
+from tests.test_data import a
 
 
 class TestSession(TestCase):
@@ -104,11 +105,98 @@ class TestSession(TestCase):
             lst = session.get_top_rows(client,"timestamp")
             for row in lst:
                 print(row)
-                kwargs = {"client":client,"hash":row}
-                rows = session.select_where_and("data",**kwargs)
+                torrent_id = session.get_torrent_id(row,client)
+                rows = session.select_where("data","torrent_id",torrent_id)
+                stamp = max([i["ts"] for i in rows])
+                self.assertEqual(stamp,lst[row])
+                rows = session.get_data_rows(row,client)
                 stamp = max([i["timestamp"] for i in rows])
                 self.assertEqual(stamp,lst[row])
 
 
+class TestActiveHashes(TestCase):
 
+    def setUp(self):
+        self.path = DATA_DIR / "active.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.storage = SqlStorage(self.path,DETAILS,changes_only=True)
+        self.storage.installation_script()
+        self.storage.heartbeat_stamp = 0
+        self.session = SqlSession(self.path,DETAILS)
+
+    def tearDown(self):
+        self.storage.connection.close()
+        self.session.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def poll(self,stamp,changed,torrents=a):
+        polled = [dict(t,client="local",timestamp=stamp) for t in torrents]
+        for torrent in polled[:changed]:
+            torrent["uploaded"] += stamp
+        with self.storage.connection.transaction():
+            self.storage.log_timestamp(stamp,"local")
+            self.storage.format_data(polled)
+
+    def test_active_hashes(self):
+        self.assertEqual(self.session.get_active_hashes(),[])
+        self.poll(1585569600,0)
+        self.assertEqual(set(self.session.get_active_hashes()),
+                         {i["hash"] for i in a})
+        self.poll(1585571400,1)
+        self.assertEqual(set(self.session.get_active_hashes()),
+                         {i["hash"] for i in a})
+        self.assertEqual(self.session.active_stamp,{"local" : 1585571400})
+        self.poll(1585573200,0,a[:2])
+        self.assertEqual(set(self.session.get_active_hashes()),
+                         {i["hash"] for i in a[:2]})
+
+    def test_rows_until_last_poll(self):
+        for stamp in (1585569600,1585571400,1585573200):
+            self.poll(stamp,0,a[:2] if stamp == 1585573200 else a)
+        self.assertEqual(len(self.storage.select_rows("data")),len(a))
+        kept = self.session.get_data_rows(a[0]["hash"],"local")
+        self.assertEqual([i["timestamp"] for i in kept],
+                         [1585569600,1585571400,1585573200])
+        dropped = self.session.get_data_rows(a[2]["hash"],"local")
+        self.assertEqual([i["timestamp"] for i in dropped],
+                         [1585569600,1585571400])
+
+
+
+class TestRollupRows(TestCase):
 
+    def setUp(self):
+        self.path = DATA_DIR / "rollup_rows.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.storage = SqlStorage(self.path,DETAILS)
+        self.storage.installation_script()
+        self.session = SqlSession(self.path,DETAILS)
+        self.start = 1585526400
+
+    def tearDown(self):
+        self.storage.connection.close()
+        self.session.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def poll(self,day):
+        stamp = self.start + day * 86400
+        polled = [dict(t,client="local",timestamp=stamp,
+                       uploaded=t["uploaded"] + day) for t in a]
+        self.storage.format_data(polled)
+
+    def test_pruned_history_charted(self):
+        for day in range(20):
+            self.poll(day)
+        self.storage.retention = {"data" : 3 * 86400}
+        self.storage.timestamp = self.start + 19 * 86400
+        self.storage.prune()
+        t_hash = a[0]["hash"]
+        db_rows = self.session.get_data_rows(t_hash,"local")
+        self.assertEqual(len(db_rows),4)
+        table, rows = self.session.get_rollup_rows(t_hash,"local",db_rows)
+        self.assertEqual(table,"daily")
+        self.assertEqual(len(rows),20)
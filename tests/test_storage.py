@@ -33,8 +33,10 @@
 import os
 import sys
 import sqlite3
+import time
+from itertools import islice
 from pathlib import Path
-from unittest import TestCase
+from unittest import TestCase, skipIf
 sys.path.append(os.getcwd())
 try:
     from tests.test_pydenv import pydenv
@@ -44,6 +46,12 @@ except:
     from tests.testsettings import DETAILS,DB_NAME,DATA_DIR,DEBUG
 
 from qtc.storage import BaseStorage, SqlStorage
+from tests.test_data import a
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 
 class TestStorage(TestCase):
@@ -117,3 +125,426 @@ class TestStorage(TestCase):
                 self.assertIn(i,data.values())
         con.close()
 
+
+class TestSyncMerge(TestCase):
+
+    def setUp(self):
+        self.storage = BaseStorage(DATA_DIR / DB_NAME,DETAILS,sync=True)
+        self.client = "local"
+        self.full = {
+            "rid": 1,
+            "full_update": True,
+            "torrents": {
+                "aaaa": {"name": "first", "uploaded": 10, "ratio": 0.5},
+                "bbbb": {"name": "second", "uploaded": 20, "ratio": 1.0},
+            }
+        }
+
+    def test_full_update(self):
+        state = self.storage.merge_sync(self.client,self.full)
+        self.assertEqual(len(state),2)
+        self.assertEqual(state["aaaa"]["hash"],"aaaa")
+        self.assertEqual(self.storage.rids[self.client],1)
+
+    def test_partial_update(self):
+        self.storage.merge_sync(self.client,self.full)
+        partial = {"rid": 2, "torrents": {"aaaa": {"uploaded": 15}},
+                   "torrents_removed": ["bbbb"]}
+        state = self.storage.merge_sync(self.client,partial)
+        self.assertEqual(list(state),["aaaa"])
+        self.assertEqual(state["aaaa"]["uploaded"],15)
+        self.assertEqual(state["aaaa"]["name"],"first")
+        self.assertEqual(self.storage.rids[self.client],2)
+
+    def test_resync(self):
+        self.storage.merge_sync(self.client,self.full)
+        resync = {"rid": 3, "full_update": True,
+                  "torrents": {"cccc": {"name": "third"}}}
+        state = self.storage.merge_sync(self.client,resync)
+        self.assertEqual(list(state),["cccc"])
+
+
+class TestQueryPlans(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.path = DATA_DIR / "plans.db"
+        if os.path.isfile(cls.path):
+            os.remove(cls.path)
+        cls.storage = SqlStorage(cls.path,DETAILS)
+        cls.storage.installation_script()
+        for torrent in a:
+            torrent = dict(torrent,client="local",timestamp=1585569600)
+            cls.storage.create_new_torrent(torrent)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.storage.connection.close()
+        if os.path.isfile(cls.path):
+            os.remove(cls.path)
+
+    def trace_queries(self,*calls):
+        statements = []
+        conn = self.storage.connection.conn
+        conn.set_trace_callback(statements.append)
+        try:
+            for func,args,kwargs in calls:
+                func(*args,**kwargs)
+        finally:
+            conn.set_trace_callback(None)
+        return [i for i in statements if i.startswith(("SELECT","DELETE"))]
+
+    def test_no_full_scans(self):
+        storage, torrent_hash = self.storage, a[0]["hash"]
+        key = {"client" : "local", "hash" : torrent_hash}
+        torrent_id = storage.load_static("local")[torrent_hash]["id"]
+        statements = self.trace_queries(
+            (storage.select_where,("data","torrent_id",torrent_id),{}),
+            (storage.select_data_where,("data.torrent_id",torrent_id),{}),
+            (storage.select_data_where,("static.client","local"),{}),
+            (storage.select_where,("static","client","local"),{}),
+            (storage.select_where_and,("static",),key),
+            (storage.select_data_max,("uploaded","local"),{}),
+            (storage.select_max,("stamps","ts"),{"client" : "local"}),
+            (storage.select_between,("stamps","ts",0,1585569600),
+             {"client" : "local"}),
+            (storage.select_data_where,("latest.seen",1585569600),
+             {"table" : "latest"}),
+            (storage.select_between,("hourly","bucket",0,1585569600),
+             {"torrent_id" : torrent_id}),
+            (storage.delete_row,("static",),key),
+        )
+        self.assertEqual(len(statements),11)
+        conn = storage.connection.conn
+        for statement in statements:
+            plan = conn.execute("EXPLAIN QUERY PLAN " + statement)
+            for row in plan.fetchall():
+                with self.subTest(statement=statement):
+                    self.assertFalse(row["detail"].startswith("SCAN"),
+                                     row["detail"])
+
+    def test_active_lookups_use_indexes(self):
+        storage = self.storage
+        statements = self.trace_queries(
+            (storage.select_max,("stamps","ts"),{"client" : "local"}),
+            (storage.select_data_where,("latest.seen",1585569600),
+             {"table" : "latest"}),
+        )
+        conn = storage.connection.conn
+        indexes = ("stamps_client_ts","latest_seen")
+        for statement,index in zip(statements,indexes):
+            plan = conn.execute("EXPLAIN QUERY PLAN " + statement)
+            details = " ".join(row["detail"] for row in plan.fetchall())
+            self.assertIn(index,details)
+
+
+
+class TestChangesOnly(TestCase):
+
+    def setUp(self):
+        self.path = DATA_DIR / "changes.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.storage = SqlStorage(self.path,DETAILS,changes_only=True)
+        self.storage.installation_script()
+        self.storage.heartbeat_stamp = 1585526400
+        self.torrents = [dict(i,client="local",timestamp=1585569600)
+                         for i in a]
+        self.storage.create_new_torrents(self.torrents)
+
+    def tearDown(self):
+        self.storage.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_skip_unchanged(self):
+        polled = [dict(i,timestamp=1585571400) for i in self.torrents]
+        polled[0]["uploaded"] += 1
+        rows = list(self.storage.filter_new(polled))
+        self.assertEqual([i["hash"] for i in rows],[polled[0]["hash"]])
+
+    def test_heartbeat(self):
+        self.storage.heartbeat_stamp = 1585569600
+        polled = [dict(i,timestamp=1585571400) for i in self.torrents]
+        rows = list(self.storage.filter_new(polled))
+        self.assertEqual(len(rows),len(polled))
+
+
+class TestConcurrentPolling(TestCase):
+
+    class SlowStorage(SqlStorage):
+        def request_client(self,client):
+            if client == "dead":
+                raise ConnectionError
+            if client == "slow":
+                time.sleep(2)
+            return [{"hash" : client}]
+
+    def test_partial_results(self):
+        clients = {"fast" : {}, "slow" : {}, "dead" : {}}
+        storage = self.SlowStorage(DATA_DIR / DB_NAME,clients,deadline=0.5)
+        storage.timestamp = "timestamp"
+        start = time.monotonic()
+        with self.assertLogs("qtc.storage","WARNING") as logs:
+            data = list(storage.get_data())
+        self.assertEqual(len(logs.records),2)
+        self.assertLess(time.monotonic() - start,1.5)
+        self.assertEqual([i["client"] for i in data],["fast"])
+        self.assertEqual(set(storage.failed_clients),{"slow","dead"})
+
+    def test_failed_clients_unstamped(self):
+        path = DATA_DIR / "stamps.db"
+        if os.path.isfile(path):
+            os.remove(path)
+        class Storage(self.SlowStorage):
+            def request_client(self,client):
+                super().request_client(client)
+                return [dict(t) for t in a[:3]]
+        clients = {"fast" : {}, "slow" : {}, "dead" : {}}
+        storage = Storage(path,clients,deadline=0.5)
+        storage.log()
+        stamps = storage.select_rows("stamps")
+        storage.connection.close()
+        os.remove(path)
+        self.assertEqual([i["client"] for i in stamps],["fast"])
+
+
+class TestMigration(TestCase):
+
+    def setUp(self):
+        self.path = DATA_DIR / "legacy.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        storage = SqlStorage(self.path,DETAILS)
+        con = sqlite3.connect(self.path)
+        static = ", ".join(storage.static_fields)
+        data = ", ".join(storage.data_fields)
+        con.execute(f"CREATE TABLE static ({static})")
+        con.execute(f"CREATE TABLE data ({data})")
+        con.execute("CREATE TABLE stamps (timestamp TEXT)")
+        for stamp in ("2020-03-30T12:00:00.000001","2020-03-30T12:30:00"):
+            con.execute("INSERT INTO stamps VALUES (?)",(stamp,))
+            for torrent in a:
+                row = dict(torrent,client="local",timestamp=stamp)
+                con.execute(f"INSERT INTO data VALUES "
+                            f"({', '.join('?' for i in storage.data_fields)})",
+                            tuple(row[i] for i in storage.data_fields))
+        for torrent in a:
+            row = dict(torrent,client="local")
+            con.execute(f"INSERT INTO static VALUES "
+                        f"({', '.join('?' for i in storage.static_fields)})",
+                        tuple(row[i] for i in storage.static_fields))
+        con.commit()
+        con.close()
+
+    def tearDown(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_migrate_v1(self):
+        storage = SqlStorage(self.path,DETAILS)
+        self.assertEqual(storage.get_schema_version(),0)
+        storage.migrate()
+        self.assertEqual(storage.get_schema_version(),5)
+        self.assertEqual(len(storage.select_rows("static")),len(a))
+        self.assertEqual(len(storage.select_rows("data")),len(a) * 2)
+        stamps = storage.select_rows("stamps")
+        self.assertEqual({i["client"] for i in stamps},{"local"})
+        stamps = [i["ts"] for i in stamps]
+        self.assertEqual(stamps[1] - stamps[0],1800)
+        rows = storage.select_data_where("static.hash",a[0]["hash"])
+        self.assertEqual({i["uploaded"] for i in rows},{a[0]["uploaded"]})
+        daily = storage.select_where("daily","torrent_id",rows[0]["torrent_id"])
+        self.assertEqual(daily[0]["samples"],2)
+        self.assertEqual(daily[0]["uploaded"],0)
+        latest = storage.select_rows("latest")
+        self.assertEqual(len(latest),len(a))
+        self.assertEqual({i["ts"] for i in latest},{stamps[1]})
+        storage.connection.close()
+
+
+class TestLatest(TestCase):
+
+    def setUp(self):
+        self.path = DATA_DIR / "latest.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.storage = SqlStorage(self.path,DETAILS)
+        self.storage.installation_script()
+
+    def tearDown(self):
+        self.storage.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_latest_on_ingest(self):
+        start = 1585569600
+        for i in range(3):
+            polled = [dict(t,client="local",timestamp=start + 1800 * i,
+                           uploaded=t["uploaded"] + 500 * i) for t in a]
+            self.storage.format_data(polled)
+        latest = self.storage.select_rows("latest")
+        self.assertEqual(len(latest),len(a))
+        row = self.storage.query_data("local",a[0]["hash"])
+        self.assertEqual(row["timestamp"],start + 3600)
+        self.assertEqual(row["uploaded"],a[0]["uploaded"] + 1000)
+        last_rows = self.storage.query_last_rows("local")
+        self.assertEqual(set(last_rows),{i["hash"] for i in a})
+
+    def test_older_rows_do_not_replace_latest(self):
+        torrents = [dict(t,client="local",timestamp=1585569600) for t in a]
+        self.storage.create_new_torrents(torrents)
+        values = [self.storage.get_data_values(dict(torrents[0],
+                                                    timestamp=1585560000))]
+        with self.storage.connection.transaction():
+            self.storage.save_data(values)
+        row = self.storage.query_data("local",a[0]["hash"])
+        self.assertEqual(row["timestamp"],1585569600)
+
+
+class TestRollups(TestCase):
+
+    def setUp(self):
+        self.path = DATA_DIR / "rollups.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.storage = SqlStorage(self.path,DETAILS)
+        self.storage.installation_script()
+
+    def tearDown(self):
+        self.storage.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_rollups_on_ingest(self):
+        start = 1585569600
+        for i in range(3):
+            polled = [dict(t,client="local",timestamp=start + 1800 * i,
+                           uploaded=t["uploaded"] + 500 * i) for t in a]
+            self.storage.format_data(polled)
+        torrent_id = self.storage.load_static("local")[a[0]["hash"]]["id"]
+        hourly = self.storage.select_where("hourly","torrent_id",torrent_id)
+        self.assertEqual([i["uploaded"] for i in hourly],[500,500])
+        self.assertEqual([i["samples"] for i in hourly],[2,1])
+        daily = self.storage.select_where("daily","torrent_id",torrent_id)
+        self.assertEqual(daily[0]["uploaded"],1000)
+        self.assertEqual(daily[0]["seeds_sum"],a[0]["num_seeds"] * 3)
+
+
+class TestRetention(TestCase):
+
+    def setUp(self):
+        self.path = DATA_DIR / "retention.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        retention = {"data" : 86400, "hourly" : 3 * 86400, "daily" : None}
+        self.storage = SqlStorage(self.path,DETAILS,retention=retention)
+        self.storage.installation_script()
+        self.start = 1585569600
+        for day in range(5):
+            polled = [dict(t,client="local",timestamp=self.start + day * 86400)
+                      for t in a]
+            self.storage.format_data(polled)
+        self.storage.timestamp = self.start + 4 * 86400
+
+    def tearDown(self):
+        self.storage.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_prune(self):
+        self.storage.prune_batch_size = 50
+        self.storage.prune()
+        stamps = {i["ts"] for i in self.storage.select_rows("data")}
+        self.assertEqual(stamps,{self.start + 3 * 86400,
+                                 self.start + 4 * 86400})
+        buckets = {i["bucket"] for i in self.storage.select_rows("hourly")}
+        self.assertEqual(min(buckets),self.start + 86400)
+        self.assertEqual(len(self.storage.select_rows("daily")),len(a) * 5)
+
+    def test_keep_last_row(self):
+        self.storage.timestamp = self.start + 30 * 86400
+        self.storage.prune()
+        self.assertEqual(len(self.storage.select_rows("data")),len(a))
+
+    def test_first_vacuum_runs(self):
+        self.storage.vacuum_interval = 86400
+        self.storage.vacuum()
+        self.assertIsNotNone(self.storage.last_vacuum)
+        last = self.storage.last_vacuum
+        self.storage.vacuum()
+        self.assertEqual(self.storage.last_vacuum,last)
+
+    def test_vacuum(self):
+        self.storage.prune()
+        self.storage.vacuum(force=True)
+        mode = self.storage.connection.conn.execute("PRAGMA auto_vacuum")
+        self.assertEqual(mode.fetchone()[0],2)
+
+
+class TestIngestMemory(TestCase):
+
+    class FakeClientStorage(SqlStorage):
+        def request_client(self,client):
+            return [dict(t,uploaded=t["uploaded"] + self.timestamp)
+                    for t in a[:20]]
+
+    def setUp(self):
+        self.path = DATA_DIR / "ingest.db"
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.storage = self.FakeClientStorage(self.path,{"local" : {}})
+        self.storage.installation_script()
+        self.storage.ingest_batch_size = 7
+
+    def tearDown(self):
+        self.storage.connection.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def poll(self,stamp):
+        storage = self.storage
+        storage.timestamp = stamp
+        with storage.connection.transaction():
+            storage.format_data(storage.get_data())
+            storage.log_timestamp(stamp)
+
+    def test_rollback_clears_caches(self):
+        storage = self.storage
+        save_rollups = storage.save_rollups
+        def fail():
+            raise sqlite3.OperationalError("disk I/O error")
+        storage.save_rollups = fail
+        with self.assertRaises(sqlite3.OperationalError):
+            storage.log()
+        self.assertEqual(storage.select_rows("static"),[])
+        storage.save_rollups = save_rollups
+        storage.log()
+        self.assertEqual(len(storage.select_rows("static")),20)
+        with storage.connection as cur:
+            orphans = cur.execute("SELECT COUNT(*) FROM data WHERE torrent_id "
+                                  "NOT IN (SELECT id FROM static)")
+            self.assertEqual(orphans.fetchone()[0],0)
+        samples = {i["samples"] for i in storage.select_rows("hourly")}
+        self.assertEqual(samples,{1})
+
+    def test_rows_per_poll(self):
+        for stamp in range(1585569600,1585569600 + 1800 * 5,1800):
+            self.poll(stamp)
+            rows = self.storage.select_where("data","ts",stamp)
+            self.assertEqual(len(rows),20)
+        self.assertEqual(len(self.storage.select_rows("data")),100)
+
+    @skipIf(resource is None,"resource module not available")
+    def test_flat_memory(self):
+        kb = 1024 if sys.platform == "darwin" else 1
+        maxrss = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss//kb
+        stamps = iter(range(1585569600,1585569600 + 1800 * 3000,1800))
+        for stamp in islice(stamps,500):
+            self.poll(stamp)
+        before = maxrss()
+        for stamp in stamps:
+            self.poll(stamp)
+        self.assertEqual(len(self.storage.select_where("data","ts",stamp)),20)
+        self.assertLess(maxrss() - before,8 * 1024)
+
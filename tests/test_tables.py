@@ -0,0 +1,109 @@
+#! /usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+######
+################################################################################
+
+
+import os
+import sys
+from unittest import TestCase
+sys.path.append(os.getcwd())
+
+from PyQt5.QtCore import Qt
+from qtc.factory import ItemFactory
+from qtc.widgets.tables import DataModel
+
+
+class FakeView:
+    def __init__(self):
+        self.checked = 0
+
+    def check_menus(self):
+        self.checked += 1
+
+
+class FakeSession:
+    win = None
+    static_fields = ("name","hash")
+    data_fields = ("timestamp","uploaded","ratio")
+
+    def __init__(self):
+        self.factory = ItemFactory()
+        self.formatted = 0
+
+    def format_column(self,field,values):
+        self.formatted += 1
+        return self.factory.format_column(field,values)
+
+    def get_headers(self,fields):
+        return [self.factory.get_label(i) for i in fields]
+
+
+class TestDataModel(TestCase):
+
+    def setUp(self):
+        self.session = FakeSession()
+        self.view = FakeView()
+        self.model = DataModel(parent=self.view)
+        self.model.setSession(self.session)
+        self.rows = [{"timestamp": 1600000000 + i*60,
+                      "uploaded": i*1000,
+                      "ratio": i/10} for i in range(1000)]
+
+    def test_receive_table(self):
+        self.model.receive_table(self.rows)
+        self.assertEqual(self.model.columnCount(),3)
+        self.assertEqual(self.model.rowCount(),self.model.fetch_size)
+        self.assertEqual(self.view.checked,1)
+        self.assertEqual(self.session.formatted,0)
+
+    def test_data(self):
+        self.model.receive_table(self.rows)
+        index = self.model.index(5,1)
+        self.assertEqual(self.model.data(index),"5.0KB")
+        self.assertEqual(self.model.data(index,Qt.UserRole),5000)
+        self.assertEqual(self.model.data(self.model.index(6,1)),"6.0KB")
+        self.assertEqual(self.session.formatted,1)
+        self.model.fetchMore()
+        last = self.model.index(self.model.fetch_size + 1,1)
+        self.assertEqual(self.model.data(last),
+                         f"{self.model.fetch_size + 1}.0KB")
+        self.assertEqual(self.session.formatted,2)
+        header = self.model.headerData(1,Qt.Horizontal)
+        self.assertEqual(header,self.session.factory.get_label("uploaded"))
+
+    def test_fetch_more(self):
+        self.model.receive_table(self.rows)
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(),len(self.rows))
+        self.model.receive_table(self.rows[:10])
+        self.assertEqual(self.model.rowCount(),10)
+        self.assertFalse(self.model.canFetchMore())
@@ -0,0 +1,110 @@
+#! /usr/bin/python
+#! -*- coding: utf-8 -*-
+
+################################################################################
+######
+###
+## Qtc v0.2
+##
+## This code written for the "Qtc" program
+##
+## This project is licensed with:
+## GNU AFFERO GENERAL PUBLIC LICENSE
+##
+## Please refer to the LICENSE file locate in the root directory of this
+## project or visit <https://www.gnu.org/licenses/agpl-3.0 for more
+## information.
+##
+## THE COPYRIGHT HOLDERS PROVIDE THE PROGRAM "AS IS" WITHOUT WARRANTY OF ANY
+## KIND, EITHER EXPRESSED OR IMPLIED, INCLUDING, BUT NOT LIMITED TO, THE
+## IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+## THE ENTIRE RISK AS TO THE QUALITY AND PERFORMANCE OF THE PROGRAM IS WITH
+## YOU. SHOULD THE PROGRAM PROVE DEFECTIVE, YOU ASSUME THE COST OF ALL
+## NECESSARY SERVICING, REPAIR OR CORRECTION.
+##
+## IN NO EVENT ANY COPYRIGHT HOLDER, OR ANY OTHER PARTY WHO MODIFIES AND/OR
+## CONVEYS THE PROGRAM AS PERMITTED ABOVE, BE LIABLE TO YOU FOR DAMAGES,
+## INCLUDING ANY GENERAL, SPECIAL, INCIDENTAL OR CONSEQUENTIAL DAMAGES ARISING
+## OUT OF THE USE OR INABILITY TO USE THE PROGRAM EVEN IF SUCH HOLDER OR OTHER
+## PARTY HAS BEEN ADVISED OF THE POSSIBILITY OF SUCH DAMAGES.
+######
+################################################################################
+
+
+import os
+import sys
+from unittest import TestCase
+sys.path.append(os.getcwd())
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+from qtc.widgets.treeview import TreeModel, TreeProxy
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class FakeSession:
+    torrents = {"qbit": [("c","cc"),("a","aa"),("b","bb")],
+                "other": [("d","dd")]}
+    uploaded = {"a": 3_000_000_000, "b": 10, "c": 20}
+
+    def __init__(self):
+        self.queried = []
+
+    def get_client_names(self):
+        return list(self.torrents)
+
+    def get_torrent_names(self,client):
+        self.queried.append(client)
+        return [{"hash": h, "name": n} for h,n in self.torrents[client]]
+
+    def get_top_rows(self,client,field):
+        return self.uploaded
+
+
+class TestTreeModel(TestCase):
+
+    def setUp(self):
+        self.session = FakeSession()
+        self.model = TreeModel(self.session)
+
+    def test_lazy_children(self):
+        top = self.model.index(0,0)
+        self.assertEqual(self.model.rowCount(),2)
+        self.assertEqual(self.model.rowCount(top),0)
+        self.assertTrue(self.model.hasChildren(top))
+        self.assertEqual(self.session.queried,[])
+        self.assertTrue(self.model.canFetchMore(top))
+        self.model.fetchMore(top)
+        self.assertEqual(self.session.queried,["qbit"])
+        self.assertEqual(self.model.rowCount(top),3)
+        self.assertFalse(self.model.canFetchMore(top))
+        child = self.model.index(1,0,top)
+        self.assertEqual(self.model.data(child),"aa")
+        self.assertEqual(self.model.parent(child),top)
+        self.assertEqual(self.model.torrent(child),("qbit","a"))
+        self.assertIsNone(self.model.torrent(top))
+        self.assertIs(self.model.data(child,Qt.FontRole),
+                      self.model.data(self.model.index(2,0,top),Qt.FontRole))
+
+    def test_sort_proxy(self):
+        proxy = TreeProxy()
+        proxy.setSourceModel(self.model)
+        top = proxy.index(0,0)
+        proxy.fetchMore(top)
+        self.model.set_sort_field("uploaded")
+        proxy.sort(0)
+        names = [proxy.index(i,0,top).data() for i in range(3)]
+        self.assertEqual(names,["bb","cc","aa"])
+        self.assertEqual(proxy.index(1,0).data(),"other")
+        self.assertEqual(self.model.children[0][0][0],"c")
+
+    def test_active_filter(self):
+        proxy = TreeProxy()
+        proxy.setSourceModel(self.model)
+        top = proxy.index(0,0)
+        proxy.fetchMore(top)
+        proxy.set_active_filter(["a"],True)
+        self.assertEqual(proxy.rowCount(top),2)
+        proxy.set_active_filter(["a"],False)
+        self.assertEqual(proxy.rowCount(top),3)